@@ -9,7 +9,125 @@
 	Python 3.13.3 documentation - https://docs.python.org/3/index.html
 """
 
-import math, typing, collections.abc, functools
+from __future__ import annotations # annotations are not evaluated at import
+
+import math, collections.abc, functools, operator, array, time, mmap, struct, os, contextvars
+
+# Import time: typing is only needed by type checkers, concurrent.futures, asyncio and inspect
+# are imported by the functions that use them (workers, async variants, instrumentation).
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+	import typing
+
+_missing = object() # sentinel for exhausted iterators and not passed arguments
+
+# Validation: iterables are checked by iter() which is needed anyway,
+# instead of isinstance(x, typing.Iterable) that goes through ABC machinery on every call.
+# Functions take validate = False to skip all argument checks for trusted callers.
+
+def _iterator(iterable: typing.Iterable, message: str) -> typing.Iterator:
+	""" Return iter(iterable), raise TypeError with message for not iterable object """
+
+	try:
+		return iter(iterable)
+	except TypeError:
+		raise TypeError(message) from None
+
+def _iterators(iterables: tuple, message: str) -> list:
+	""" Return iter() of every iterable, raise TypeError with message for not iterable object """
+
+	try:
+		return [iter(i) for i in iterables]
+	except TypeError:
+		raise TypeError(message) from None
+
+# Instrumentation: the active Instrumentation (see the Instrumentation section) is kept per context,
+# so calls of other threads and tasks are not measured. Functions returning lists check it at the call,
+# generator functions are wrapped by _instrumented_generator, so a generator is measured if it was
+# created inside "with Instrumentation()", whenever it is consumed.
+
+_instrumentation = contextvars.ContextVar("instrumentation", default = None)
+
+def _instrumented_generator(generator_function: typing.Callable) -> typing.Callable:
+	""" Return generator_function that is measured by the Instrumentation active at its call """
+
+	@functools.wraps(generator_function)
+	def generator(*args, **kwargs):
+		instrumentation = _instrumentation.get()
+
+		if instrumentation is None:
+			return generator_function(*args, **kwargs)
+
+		return instrumentation.stream(generator_function, _bound_arguments(generator_function, args, kwargs))
+
+	return generator
+
+# Batches: generators take batch_size = N to yield lists (or array.array of typecode) of N results,
+# the consumer resumes the generator once per batch instead of once per item.
+
+def _batch_arguments(batch_size: int, typecode: typing.Optional[str] = None) -> None:
+	""" Validate batch arguments """
+
+	if not isinstance(batch_size, int):
+		raise TypeError("\nTypeError: expected int object")
+
+	if batch_size < 1:
+		raise ValueError("\nValueError: expected positive batch_size")
+
+	if typecode is not None and typecode not in array.typecodes:
+		raise ValueError(f"\nValueError: expected typecode one of {array.typecodes}")
+
+def _batched(items: typing.Iterator, batch_size: int, typecode: typing.Optional[str] = None) -> typing.Generator[typing.Union[list, array.array], None, None]:
+	""" Yield batches of batch_size items, the last one can be shorter """
+
+	for batch in _chunks(items, batch_size):
+		yield batch if typecode is None else array.array(typecode, batch)
+
+# Buffers: bytes, bytearray, memoryview and array.array inputs are read through a memoryview
+# without copying, their length is known, so results can be preallocated.
+# custom_map and custom_filter take out = writable buffer to store results there instead of a new list.
+
+_buffer_types = (bytes, bytearray, memoryview, array.array) # not mmap: its items are 1-byte bytes, not ints
+_buffer_formats = frozenset("bBhHiIlLqQnNefd?")
+
+def _buffer_view(obj: typing.Any) -> typing.Optional[memoryview]:
+	""" Return one-dimensional memoryview of buffer object with numeric items or None """
+
+	if not isinstance(obj, _buffer_types):
+		return None
+
+	view = memoryview(obj)
+
+	if view.ndim != 1 or view.format.lstrip("@") not in _buffer_formats:
+		return None
+
+	return view
+
+def _output_view(out: typing.Any) -> memoryview:
+	""" Return memoryview of writable out buffer """
+
+	view = _buffer_view(out)
+
+	if view is None or view.readonly:
+		raise TypeError("\nTypeError: expected writable array.array, bytearray or memoryview out object")
+
+	return view
+
+def _write_out(values: typing.Iterable, view: memoryview) -> memoryview:
+	""" Store values into view from the start, return view of the written part """
+
+	count = 0
+	length = len(view)
+
+	for value in values:
+		if count == length:
+			raise ValueError("\nValueError: expected out object long enough for all results")
+
+		view[count] = value
+		count += 1
+
+	return view[:count]
 
 # Implementation built-in functions
 
@@ -27,8 +145,8 @@ import math, typing, collections.abc, functools
 	When step is given, it specifies the increment (or decrement).
 """
 
-def custom_range_generator(start: int = 0, stop: typing.Optional[int] = None, step: int = 1) -> typing.Generator[int, None, None]:
-	""" Implementation built-in range generator function through use yield """
+def _range_arguments(start: int, stop: typing.Optional[int], step: int) -> tuple:
+	""" Validate range arguments and return normalized (start, stop, step) """
 
 	if not isinstance(start, int) or not isinstance(step, int):
 		raise TypeError("\nTypeError: expected int object")
@@ -43,6 +161,13 @@ def custom_range_generator(start: int = 0, stop: typing.Optional[int] = None, st
 		stop = start
 		start = 0
 
+	return start, stop, step
+
+def custom_range_generator(start: int = 0, stop: typing.Optional[int] = None, step: int = 1) -> typing.Generator[int, None, None]:
+	""" Implementation built-in range generator function through use yield """
+
+	start, stop, step = _range_arguments(start, stop, step)
+
 	if step > 0:
 		while start < stop:
 			yield start
@@ -54,6 +179,133 @@ def custom_range_generator(start: int = 0, stop: typing.Optional[int] = None, st
 
 	return None
 
+class CustomRange:
+	""" Implementation built-in range object, len/in/index/slicing are computed arithmetically in O(1) """
+
+	__slots__ = ("_start", "_stop", "_step", "_length")
+
+	def __init__(self, start: int = 0, stop: typing.Optional[int] = None, step: int = 1) -> None:
+		self._start, self._stop, self._step = _range_arguments(start, stop, step)
+
+		if self._step > 0 and self._start < self._stop:
+			self._length = (self._stop - self._start - 1) // self._step + 1
+		elif self._step < 0 and self._start > self._stop:
+			self._length = (self._start - self._stop - 1) // -self._step + 1
+		else:
+			self._length = 0
+
+	@property
+	def start(self) -> int:
+		return self._start
+
+	@property
+	def stop(self) -> int:
+		return self._stop
+
+	@property
+	def step(self) -> int:
+		return self._step
+
+	def __repr__(self) -> str:
+		if self._step == 1:
+			return f"CustomRange({self._start}, {self._stop})"
+
+		return f"CustomRange({self._start}, {self._stop}, {self._step})"
+
+	def __len__(self) -> int:
+		return self._length
+
+	def __bool__(self) -> bool:
+		return self._length != 0
+
+	def __iter__(self) -> typing.Iterator[int]:
+		return custom_range_generator(self._start, self._stop, self._step)
+
+	def __reversed__(self) -> typing.Iterator[int]:
+		# From the last value down to the value before start
+		last = self._start + (self._length - 1) * self._step
+
+		return custom_range_generator(last, self._start - self._step, -self._step)
+
+	def _position(self, value: int) -> int:
+		""" Return index of int value or -1 """
+
+		offset = value - self._start
+
+		if offset % self._step:
+			return -1
+
+		i = offset // self._step
+
+		return i if 0 <= i < self._length else -1
+
+	def __contains__(self, value: typing.Any) -> bool:
+		if isinstance(value, int):
+			return self._position(value) != -1
+
+		# Like built-in range, not int values are compared one by one
+		return any(value == i for i in self)
+
+	def index(self, value: typing.Any) -> int:
+		""" Return index of value, raise ValueError if value is not present """
+
+		if isinstance(value, int):
+			i = self._position(value)
+
+			if i != -1:
+				return i
+		else:
+			for i, item in enumerate(self):
+				if value == item:
+					return i
+
+		raise ValueError(f"\nValueError: {value!r} is not in range")
+
+	def count(self, value: typing.Any) -> int:
+		""" Return number of occurrences of value """
+
+		if isinstance(value, int):
+			return int(self._position(value) != -1)
+
+		return sum(1 for i in self if value == i)
+
+	def __getitem__(self, key: typing.Union[int, slice]) -> typing.Union[int, "CustomRange"]:
+		if isinstance(key, slice):
+			start, stop, step = key.indices(self._length)
+
+			return CustomRange(self._start + start * self._step, self._start + stop * self._step, self._step * step)
+
+		if not isinstance(key, int):
+			raise TypeError("\nTypeError: expected int or slice object")
+
+		if key < 0:
+			key += self._length
+
+		if not 0 <= key < self._length:
+			raise IndexError("\nIndexError: range object index out of range")
+
+		return self._start + key * self._step
+
+	def _key(self) -> tuple:
+		""" Values that define the produced sequence, like for built-in range equality """
+
+		if self._length == 0:
+			return (0, None, None)
+
+		if self._length == 1:
+			return (1, self._start, None)
+
+		return (self._length, self._start, self._step)
+
+	def __eq__(self, other: typing.Any) -> bool:
+		if not isinstance(other, CustomRange):
+			return NotImplemented
+
+		return self._key() == other._key()
+
+	def __hash__(self) -> int:
+		return hash(self._key())
+
 """
 	---------- Implementing filter ----------
 
@@ -102,21 +354,58 @@ def is_even(num: int) -> bool:
 
 	return not (abs(num) & 1) # abs(num) % 2 == 0
 
-def custom_filter(function: typing.Callable[[int], bool], iterable: typing.Iterable[int]) -> typing.Iterable[int]:
+def custom_filter(function: typing.Callable[[int], bool], iterable: typing.Iterable[int], backend: str = "python", workers: typing.Optional[int] = None, chunksize: int = 1, executor: str = "process", ordered: bool = True, validate: bool = True, out: typing.Any = None) -> typing.Iterable[int]:
 	""" Implementing built-in filter function """
 
-	if not callable(function) and function is not None:
-		# Version I
-		"""
-		print("\nInvalid value type: expected function(int) -> bool or None")
-		return None
-		"""
+	if _instrumentation.get() is not None:
+		return _instrumentation.get().call(custom_filter, locals())
 
-		# Version II
-		raise TypeError("\nTypeError: expected function(int) -> bool or None")
+	if validate:
+		if not callable(function) and function is not None:
+			# Version I
+			"""
+			print("\nInvalid value type: expected function(int) -> bool or None")
+			return None
+			"""
+
+			# Version II
+			raise TypeError("\nTypeError: expected function(int) -> bool or None")
+
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object with int values")
+	else:
+		iterator = iter(iterable)
+
+	if out is not None:
+		view = _output_view(out)
+
+	if backend == "python" and workers is None and out is None:
+		# FilterIndex query over its own index, items are found without checking every one
+		positions = _index_positions(function, iterable)
+
+		if positions is not None:
+			return [iterable[i] for i in positions]
+
+	if backend != "python" and out is None:
+		kernel = _backend_kernel(backend, "filter", function)
 
-	if not isinstance(iterable, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable object with int values")
+		if kernel is not None:
+			filter_iterable = kernel(iterable)
+
+			if filter_iterable is not _missing:
+				return filter_iterable
+
+	if workers is not None:
+		_parallel_arguments(workers, chunksize, executor, ordered)
+
+		filter_iterable = _parallel_chunks(_filter_chunk, function, iterator, workers, chunksize, executor, ordered)
+
+		return list(filter_iterable) if out is None else _write_out(filter_iterable, view)
+
+	if out is not None:
+		if function is None:
+			return _write_out((i for i in iterator if i), view)
+
+		return _write_out((i for i in iterator if function(i)), view)
 
 	filter_iterable = []
 
@@ -131,35 +420,82 @@ def custom_filter(function: typing.Callable[[int], bool], iterable: typing.Itera
 		# Version II
 		function = lambda x : x
 
-	for i in iterable:
+	for i in iterator:
 		if function(i): # function(i) == True
 			filter_iterable.append(i)
 
 	return filter_iterable
 
-def custom_filter_generator(function: typing.Callable[[int], bool], iterable: typing.Iterable[int]) -> typing.Iterable[int]:
+@_instrumented_generator
+def custom_filter_generator(function: typing.Callable[[int], bool], iterable: typing.Iterable[int], workers: typing.Optional[int] = None, chunksize: int = 1, executor: str = "process", ordered: bool = True, validate: bool = True, batch_size: typing.Optional[int] = None, typecode: typing.Optional[str] = None, checkpoint: typing.Optional["Checkpoint"] = None, resume_from: typing.Any = None) -> typing.Iterable[int]:
 	""" Implementing built-in filter generator function through using yield """
 
-	if not callable(function) and function is not None:
-		raise TypeError("\nTypeError: expected function(int) -> bool or None")
+	if validate:
+		if not callable(function) and function is not None:
+			raise TypeError("\nTypeError: expected function(int) -> bool or None")
+
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object with int values")
+	else:
+		iterator = iter(iterable)
 
-	if not isinstance(iterable, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable object with int values")
+	if batch_size is not None:
+		_batch_arguments(batch_size, typecode)
 
-	filter_iterable = []
+	if checkpoint is not None or resume_from is not None:
+		checkpoint = _checkpoint_arguments(checkpoint, resume_from, workers, batch_size)
+
+		for i in _resumed_iterator(iterable, iterator, checkpoint.offset):
+			keep = i if function is None else function(i)
+
+			checkpoint.offset += 1
+
+			if keep:
+				yield i
+
+		return None
+
+	if workers is not None:
+		_parallel_arguments(workers, chunksize, executor, ordered)
+
+		items = _parallel_chunks(_filter_chunk, function, iterator, workers, chunksize, executor, ordered)
+
+		yield from items if batch_size is None else _batched(items, batch_size, typecode)
+
+		return None
+
+	positions = _index_positions(function, iterable)
+
+	if positions is not None:
+		items = (iterable[i] for i in positions)
+
+		yield from items if batch_size is None else _batched(items, batch_size, typecode)
+
+		return None
 
 	if function is None:
 		function = lambda x : x
 
-	j = 0
+	if batch_size is not None:
+		batch = [] if typecode is None else array.array(typecode)
 
-	for i in iterable:
-		if function(i):
-			filter_iterable.append(i)
+		for i in iterator:
+			if function(i):
+				batch.append(i)
+
+				if len(batch) == batch_size:
+					yield batch
+
+					batch = [] if typecode is None else array.array(typecode)
 
-			yield filter_iterable[j]
+		if batch:
+			yield batch
 
-			j += 1
+		return None
+
+	# Streaming mode: yielded items are not kept, state is O(1)
+	for i in iterator:
+		if function(i):
+			yield i
 
 	return None
 
@@ -202,71 +538,202 @@ def custom_filter_generator(function: typing.Callable[[int], bool], iterable: ty
 	print(result)  # Output: [1, 4, 9, 16]
 """
 
-def custom_map(function: typing.Callable[[int], int], *iterables: typing.Iterable[int]) -> list:
+def square(num: int) -> int:
+	""" Return square of number """
+
+	return num * num
+
+def custom_map(function: typing.Callable[[int], int], *iterables: typing.Iterable[int], backend: str = "python", workers: typing.Optional[int] = None, chunksize: int = 1, executor: str = "process", ordered: bool = True, validate: bool = True, cache: typing.Union[int, "MapCache", None] = None, out: typing.Any = None) -> list:
 	""" Implementing built-in map function """
 
-	if not callable(function):
-		raise TypeError("\nTypeError: expected function(int) -> int")
+	if _instrumentation.get() is not None:
+		return _instrumentation.get().call(custom_map, locals())
 
-	if not isinstance(iterables, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable objects with int values")
+	if validate:
+		if not callable(function):
+			raise TypeError("\nTypeError: expected function(int) -> int")
 
-	if function is None:
-		raise ValueError("\nValueError: expected function(int) -> int")
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects with int values")
 
-	# Version I
-	"""
-	iterables_min_length = len(iterables[0])
+		if not iterators:
+			raise TypeError("\nTypeError: expected at least one iterable object")
+	else:
+		iterators = [iter(i) for i in iterables]
 
-	for i in iterables[1:]:
-		if len(i) < iterables_min_length:
-			iterables_min_length = len(i)
-	"""
+	if out is not None:
+		view = _output_view(out)
+
+	if backend != "python" and out is None:
+		kernel = _backend_kernel(backend, "map", function)
+
+		if kernel is not None:
+			map_iterables = kernel(*iterables)
+
+			if map_iterables is not _missing:
+				return map_iterables
+
+	if cache is not None:
+		function = _cached_function(function, cache, workers)
+
+	if workers is not None:
+		_parallel_arguments(workers, chunksize, executor, ordered)
 
-	# Version II
-	iterables_min_length = min(len(i) for i in iterables) # iterables_min_length = len(min(*iterables, key = len))
+		map_iterables = _parallel_chunks(_map_chunk, function, _zip_iterators(iterators), workers, chunksize, executor, ordered)
+
+		return list(map_iterables) if out is None else _write_out(map_iterables, view)
+
+	if out is not None:
+		return _write_out(custom_map_generator(function, *iterators, validate = False), view)
 
 	map_iterables = []
 
-	for i in range(iterables_min_length):
-		tmp_iterables = []
+	# Items are taken lazily through iter()/next(), stops when the shortest iterable is exhausted.
+	# 1, 2 and 3 iterables have own loops without a row list or tuple per item.
+	if len(iterators) == 1:
+		for i in iterators[0]:
+			map_iterables.append(function(i))
+
+	elif len(iterators) == 2:
+		first, second = iterators
+
+		for i in first:
+			j = next(second, _missing)
+
+			if j is _missing:
+				break
+
+			map_iterables.append(function(i, j))
+
+	elif len(iterators) == 3:
+		first, second, third = iterators
+
+		for i in first:
+			j = next(second, _missing)
 
-		for j in iterables:
-			tmp_iterables.append(j[i])
+			if j is _missing:
+				break
 
-		map_iterables.append(function(*tmp_iterables))
+			k = next(third, _missing)
+
+			if k is _missing:
+				break
+
+			map_iterables.append(function(i, j, k))
+
+	else:
+		# One row list is reused for all items, function(*row) is a single call
+		row = [None] * len(iterators)
+
+		while True:
+			for position, j in enumerate(iterators):
+				item = next(j, _missing)
+
+				if item is _missing:
+					return map_iterables
+
+				row[position] = item
+
+			map_iterables.append(function(*row))
 
 	return map_iterables
 
-def custom_map_generator(function: typing.Callable[[int], int], *iterables: typing.Iterable[int]) -> typing.Generator[list, None, None]:
+@_instrumented_generator
+def custom_map_generator(function: typing.Callable[[int], int], *iterables: typing.Iterable[int], workers: typing.Optional[int] = None, chunksize: int = 1, executor: str = "process", ordered: bool = True, validate: bool = True, batch_size: typing.Optional[int] = None, typecode: typing.Optional[str] = None, cache: typing.Union[int, "MapCache", None] = None, checkpoint: typing.Optional["Checkpoint"] = None, resume_from: typing.Any = None) -> typing.Generator[list, None, None]:
 	""" Implementing built-in map generator function through using yield """
 
-	if not callable(function):
-		raise TypeError("\nTypeError: expected function(int) -> int")
+	if validate:
+		if not callable(function):
+			raise TypeError("\nTypeError: expected function(int) -> int")
 
-	if not isinstance(iterables, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable objects with int values")
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects with int values")
 
-	if function is None:
-		raise ValueError("\nValueError: expected function(int) -> int")
+		if not iterators:
+			raise TypeError("\nTypeError: expected at least one iterable object")
+	else:
+		iterators = [iter(i) for i in iterables]
 
-	iterables_min_length = min(len(i) for i in iterables) # iterables_min_length = len(min(*iterables, key = len))
+	if batch_size is not None:
+		_batch_arguments(batch_size, typecode)
 
-	map_iterables = []
+	if cache is not None:
+		function = _cached_function(function, cache, workers)
+
+	if checkpoint is not None or resume_from is not None:
+		checkpoint = _checkpoint_arguments(checkpoint, resume_from, workers, batch_size)
+		iterators = [_resumed_iterator(i, j, checkpoint.offset) for i, j in zip(iterables, iterators)]
+
+		# Offset is moved after the item is computed, a failed item is read again after a restart
+		for row in _zip_iterators(iterators):
+			result = function(*row)
+
+			checkpoint.offset += 1
+
+			yield result
+
+		return None
+
+	if workers is not None:
+		_parallel_arguments(workers, chunksize, executor, ordered)
+
+		items = _parallel_chunks(_map_chunk, function, _zip_iterators(iterators), workers, chunksize, executor, ordered)
+
+		yield from items if batch_size is None else _batched(items, batch_size, typecode)
+
+		return None
+
+	if batch_size is not None:
+		for rows in _zip_iterators(iterators, batch_size = batch_size):
+			batch = _map_chunk(function, rows)
+
+			yield batch if typecode is None else array.array(typecode, batch)
+
+		return None
+
+	# Streaming mode: yielded items are not kept, state is O(1), loops are the same as in custom_map
+	if len(iterators) == 1:
+		for i in iterators[0]:
+			yield function(i)
+
+	elif len(iterators) == 2:
+		first, second = iterators
+
+		for i in first:
+			j = next(second, _missing)
+
+			if j is _missing:
+				break
 
-	x = 0
+			yield function(i, j)
 
-	for i in range(iterables_min_length):
-		tmp_iterables = []
+	elif len(iterators) == 3:
+		first, second, third = iterators
 
-		for j in iterables:
-			tmp_iterables.append(j[i])
+		for i in first:
+			j = next(second, _missing)
 
-		map_iterables.append(function(*tmp_iterables))
+			if j is _missing:
+				break
 
-		yield map_iterables[x]
+			k = next(third, _missing)
 
-		x += 1
+			if k is _missing:
+				break
+
+			yield function(i, j, k)
+
+	else:
+		row = [None] * len(iterators)
+
+		while True:
+			for position, j in enumerate(iterators):
+				item = next(j, _missing)
+
+				if item is _missing:
+					return None
+
+				row[position] = item
+
+			yield function(*row)
 
 	return None
 
@@ -310,147 +777,337 @@ def custom_map_generator(function: typing.Callable[[int], int], *iterables: typi
 	print(result)  # Output: [(1, 'a'), (2, 'b'), (3, 'c')]
 """
 
-def custom_zip(*iterables: typing.Iterable[int], strict: bool = False) -> tuple:
-	""" Implementing built-in zip function """
+def _zip_iterators(iterators: list, strict: bool = False, batch_size: typing.Optional[int] = None) -> typing.Generator[tuple, None, None]:
+	""" Yield tuples of next items of all iterators through next() until the shortest is exhausted, or lists of batch_size tuples """
 
-	if not isinstance(iterables, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable objects with int values")
+	if not iterators:
+		return None
 
-	if not isinstance(strict, bool):
-		raise TypeError("\nTypeError: expected bool")
+	if batch_size is None and len(iterators) <= 3:
+		# 1, 2 and 3 iterators: the row tuple is built directly, without a row list
+		yield from _zip_few_iterators(iterators, strict)
 
-	zip_iterables = []
+		return None
 
-	iterables_min_length = len(iterables[0])
+	batch = []
+	row = [None] * len(iterators) # reused for all rows, only the row tuple is created
 
-	for i in iterables[1:]:
-		if len(i) < iterables_min_length:
-			if strict:
-				raise ValueError("\nValueError: expected all iterables equal length")
+	while True:
+		for position, j in enumerate(iterators):
+			item = next(j, _missing)
 
-			iterables_min_length = len(i)
+			if item is _missing:
+				# Rows before the exhaustion are delivered before a strict error
+				if batch:
+					yield batch
 
-	for i in range(iterables_min_length):
-		tmp_iterables = []
+				if strict:
+					_zip_strict_check(iterators, position)
 
-		for j in iterables:
-			tmp_iterables.append(j[i])
+				return None
 
-		zip_iterables.append(tuple(tmp_iterables))
+			row[position] = item
 
-	return zip_iterables
+		if batch_size is None:
+			yield tuple(row)
+		else:
+			batch.append(tuple(row))
 
-def custom_zip_generator(*iterables: typing.Iterable[int], strict: bool = False) -> typing.Generator[tuple, None, None]:
-	""" Implementing built-in zip generator function through using yield """
+			if len(batch) == batch_size:
+				yield batch
 
-	if not all(isinstance(i, typing.Iterable) for i in iterables):
-		raise TypeError("\nTypeError: expected iterable objects with int values")
+				batch = []
 
-	if not isinstance(strict, bool):
-		raise TypeError("\nTypeError: expected bool")
+def _zip_strict_check(iterators: list, position: int) -> None:
+	""" Like built-in zip, lengths are checked at the point of exhaustion of iterator at position """
 
-	zip_iterables = []
+	if position:
+		raise ValueError("\nValueError: expected all iterables equal length")
 
-	iterables_min_length = len(iterables[0])
+	for k in iterators[1:]:
+		if next(k, _missing) is not _missing:
+			raise ValueError("\nValueError: expected all iterables equal length")
 
-	for i in iterables[1:]:
-		if len(i) < iterables_min_length:
-			if strict:
-				raise ValueError("\nValueError: expected all iterables equal length")
+def _zip_few_iterators(iterators: list, strict: bool) -> typing.Generator[tuple, None, None]:
+	""" _zip_iterators of 1, 2 or 3 iterators """
 
-			iterables_min_length = len(i)
+	if len(iterators) == 1:
+		for i in iterators[0]:
+			yield (i,)
 
-		elif len(i) > iterables_min_length and strict:
-			raise ValueError("\nValueError: expected all iterables equal length")
+	elif len(iterators) == 2:
+		first, second = iterators
 
-	for i in range(iterables_min_length):
-		tmp_iterables = []
+		for i in first:
+			j = next(second, _missing)
 
-		for j in iterables:
-			tmp_iterables.append(j[i])
+			if j is _missing:
+				if strict:
+					_zip_strict_check(iterators, 1)
 
-		yield tuple(tmp_iterables)
+				return None
 
-	return None
+			yield (i, j)
 
-"""
-	---------- Implementing reduce ----------
+	else:
+		first, second, third = iterators
 
-	reduce(...)
-		reduce(function, iterable[, initial]) -> value
+		for i in first:
+			j = next(second, _missing)
 
-	Apply a function of two arguments cumulatively to the items of a sequence
-	or iterable, from left to right, so as to reduce the iterable to a single
-	value.  For example, reduce(lambda x, y: x+y, [1, 2, 3, 4, 5]) calculates
-	((((1+2)+3)+4)+5).  If initial is present, it is placed before the items
-	of the iterable in the calculation, and serves as a default when the
-	iterable is empty.
+			if j is _missing:
+				if strict:
+					_zip_strict_check(iterators, 1)
 
-	----------------------------------------------------------------------------------------------------
+				return None
 
-	Function named custom_reduce that replicates the behavior
-	of the functools.reduce function. Implementation should take three arguments:
+			k = next(third, _missing)
 
-	1. A binary function (takes two inputs).
-	2. An iterable.
-	3. An optional initializer (default is None).
+			if k is _missing:
+				if strict:
+					_zip_strict_check(iterators, 2)
 
-	The function should apply the binary function cumulatively to the items in the iterable,
-	reducing it to a single value.
+				return None
 
-	Requirements:
+			yield (i, j, k)
 
-	* If an initializer is provided, use it as the starting value.
-	* If no initializer is provided, use the first element of the iterable as the starting value.
-	* Raise an error if the iterable is empty and no initializer is provided.
+	if strict:
+		_zip_strict_check(iterators, 0)
 
-	Example:
+	return None
 
-	# Example usage of custom_reduce
-	def add(x, y):
-		return x + y
+def custom_zip(*iterables: typing.Iterable[int], strict: bool = False, validate: bool = True, view: bool = False, columnar: bool = False) -> tuple:
+	""" Implementing built-in zip function """
 
-	numbers = [1, 2, 3, 4]
-	result = custom_reduce(add, numbers)
-	print(result)  # Output: 10
-"""
+	if _instrumentation.get() is not None:
+		return _instrumentation.get().call(custom_zip, locals())
 
-def custom_reduce(function: typing.Callable[[int, int], int], iterable: typing.Iterable[int], initial: typing.Optional[int] = None) -> int:
-	""" Implementing functools.reduce function """
+	if view:
+		return ZipView(*iterables, strict = strict)
 
-	if not callable(function):
-		raise TypeError("\nTypeError: expected callable object(function), (int, int) -> int")
+	if validate:
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects with int values")
 
-	if not isinstance(iterable, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable object")
+		if not isinstance(strict, bool):
+			raise TypeError("\nTypeError: expected bool")
+	else:
+		iterators = [iter(i) for i in iterables]
 
-	if not function:
-		raise ValueError("\nValueError: expected function(int, int) -> int")
+	if columnar:
+		return Columns(_columns(_zip_iterators(iterators, strict), len(iterators)))
 
-	if not iterable:
-		raise ValueError("\nValueError: expected not empty iterable")
+	# A cheap type check first, memoryviews are only built when the first input is a buffer
+	if iterables and type(iterables[0]) in _buffer_types:
+		views = [_buffer_view(i) for i in iterables]
 
-	if initial is None:
-		value = iterable[0]
-		start_i = 1
-	else:
-		value = initial
-		start_i = 0
+		if None not in views:
+			return _zip_buffers(views, strict)
 
-	for i in range(start_i, len(iterable)):
-		value = function(value, iterable[i])
+	return list(_zip_iterators(iterators, strict))
 
-	return value
+def _zip_buffers(views: list, strict: bool) -> list:
+	""" custom_zip of buffers: lengths are known, result list is preallocated and filled by index """
 
-"""
-	---------- Implementing enumerate ----------
+	length = min(len(v) for v in views)
 
-	class enumerate(object)
-		enumerate(iterable, start=0)
+	if strict and any(len(v) != length for v in views):
+		raise ValueError("\nValueError: expected all iterables equal length")
 
-	Return an enumerate object.
+	zip_iterables = [None] * length
 
-	iterable an object supporting iteration.
+	if len(views) == 2:
+		first, second = views
+
+		for i in range(length):
+			zip_iterables[i] = (first[i], second[i])
+	else:
+		for i in range(length):
+			zip_iterables[i] = tuple([j[i] for j in views])
+
+	return zip_iterables
+
+@_instrumented_generator
+def custom_zip_generator(*iterables: typing.Iterable[int], strict: bool = False, validate: bool = True, batch_size: typing.Optional[int] = None) -> typing.Generator[tuple, None, None]:
+	""" Implementing built-in zip generator function through using yield """
+
+	if validate:
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects with int values")
+
+		if not isinstance(strict, bool):
+			raise TypeError("\nTypeError: expected bool")
+	else:
+		iterators = [iter(i) for i in iterables]
+
+	if batch_size is not None:
+		_batch_arguments(batch_size)
+
+	yield from _zip_iterators(iterators, strict, batch_size)
+
+	return None
+
+def custom_zip_longest(*iterables: typing.Iterable[int], fillvalue: typing.Any = None, strict: bool = False, validate: bool = True) -> list:
+	""" Implementing itertools.zip_longest function """
+
+	if validate:
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects with int values")
+
+		if not isinstance(strict, bool):
+			raise TypeError("\nTypeError: expected bool")
+	else:
+		iterators = [iter(i) for i in iterables]
+
+	return list(_zip_longest_iterators(iterators, fillvalue, strict))
+
+def custom_zip_longest_generator(*iterables: typing.Iterable[int], fillvalue: typing.Any = None, strict: bool = False, validate: bool = True) -> typing.Generator[tuple, None, None]:
+	""" Implementing itertools.zip_longest generator function through using yield """
+
+	if validate:
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects with int values")
+
+		if not isinstance(strict, bool):
+			raise TypeError("\nTypeError: expected bool")
+	else:
+		iterators = [iter(i) for i in iterables]
+
+	yield from _zip_longest_iterators(iterators, fillvalue, strict)
+
+	return None
+
+def _zip_longest_iterators(iterators: list, fillvalue: typing.Any, strict: bool) -> typing.Generator[tuple, None, None]:
+	""" Yield tuples of next items of all iterators until the longest is exhausted, fillvalue for exhausted ones """
+
+	remaining = len(iterators)
+	row = [None] * remaining
+
+	while remaining:
+		for position, j in enumerate(iterators):
+			if j is None:
+				row[position] = fillvalue
+
+				continue
+
+			item = next(j, _missing)
+
+			if item is _missing:
+				if strict:
+					# Lengths must be equal, the same check as in strict zip
+					_zip_strict_check(iterators, position)
+
+					return None
+
+				remaining -= 1
+
+				if not remaining:
+					return None
+
+				iterators[position] = None
+				item = fillvalue
+
+			row[position] = item
+
+		yield tuple(row)
+
+	return None
+
+"""
+	---------- Implementing reduce ----------
+
+	reduce(...)
+		reduce(function, iterable[, initial]) -> value
+
+	Apply a function of two arguments cumulatively to the items of a sequence
+	or iterable, from left to right, so as to reduce the iterable to a single
+	value.  For example, reduce(lambda x, y: x+y, [1, 2, 3, 4, 5]) calculates
+	((((1+2)+3)+4)+5).  If initial is present, it is placed before the items
+	of the iterable in the calculation, and serves as a default when the
+	iterable is empty.
+
+	----------------------------------------------------------------------------------------------------
+
+	Function named custom_reduce that replicates the behavior
+	of the functools.reduce function. Implementation should take three arguments:
+
+	1. A binary function (takes two inputs).
+	2. An iterable.
+	3. An optional initializer (default is None).
+
+	The function should apply the binary function cumulatively to the items in the iterable,
+	reducing it to a single value.
+
+	Requirements:
+
+	* If an initializer is provided, use it as the starting value.
+	* If no initializer is provided, use the first element of the iterable as the starting value.
+	* Raise an error if the iterable is empty and no initializer is provided.
+
+	Example:
+
+	# Example usage of custom_reduce
+	def add(x, y):
+		return x + y
+
+	numbers = [1, 2, 3, 4]
+	result = custom_reduce(add, numbers)
+	print(result)  # Output: 10
+"""
+
+def custom_reduce(function: typing.Callable[[int, int], int], iterable: typing.Iterable[int], initial: typing.Any = _missing, backend: str = "python", associative: bool = False, pairwise: bool = False, workers: typing.Optional[int] = None, chunksize: typing.Optional[int] = None, executor: str = "process", validate: bool = True) -> int:
+	""" Implementing functools.reduce function """
+
+	if _instrumentation.get() is not None:
+		return _instrumentation.get().call(custom_reduce, locals())
+
+	if validate:
+		if not callable(function):
+			raise TypeError("\nTypeError: expected callable object(function), (int, int) -> int")
+
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
+
+		if not function:
+			raise ValueError("\nValueError: expected function(int, int) -> int")
+
+		if not isinstance(associative, bool) or not isinstance(pairwise, bool):
+			raise TypeError("\nTypeError: expected bool")
+
+		if (pairwise or workers is not None) and not associative:
+			raise ValueError("\nValueError: expected associative = True for pairwise or workers")
+	else:
+		iterator = iter(iterable)
+
+	if backend != "python":
+		kernel = _backend_kernel(backend, "reduce", function)
+
+		if kernel is not None:
+			value = kernel(iterable, initial)
+
+			if value is not _missing:
+				return value
+
+	if associative:
+		return _associative_reduce(function, iterator, initial, pairwise, workers, chunksize, executor)
+
+	if initial is _missing:
+		value = next(iterator, _missing)
+
+		if value is _missing:
+			raise TypeError("\nTypeError: reduce() of empty iterable with no initial value")
+	else:
+		value = initial
+
+	for i in iterator:
+		value = function(value, i)
+
+	return value
+
+"""
+	---------- Implementing enumerate ----------
+
+	class enumerate(object)
+		enumerate(iterable, start=0)
+
+	Return an enumerate object.
+
+	iterable an object supporting iteration.
 
 	The enumerate object yields pairs containing a count (from start, which
 	
@@ -482,47 +1139,2302 @@ def custom_reduce(function: typing.Callable[[int, int], int], iterable: typing.I
 	print(result)  # Output: [(1, 'apple'), (2, 'banana'), (3, 'cherry')]
 """
 
-def custom_enumerate(iterable: typing.Iterable[int], start: int = 0) -> enumerate:
+def custom_enumerate(iterable: typing.Iterable[int], start: int = 0, validate: bool = True, offsets: bool = False, view: bool = False, columnar: bool = False) -> enumerate:
 	""" Implementing built-in enumerate function """
 
-	if not isinstance(iterable, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable object")
+	if _instrumentation.get() is not None:
+		return _instrumentation.get().call(custom_enumerate, locals())
 
-	if not isinstance(start, int):
-		raise TypeError("\nTypeError: expected int")
+	if view:
+		return EnumerateView(iterable, start)
 
-	if not iterable:
-		raise ValueError("\nValueError: expected not empty object")
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
+
+		if not isinstance(start, int):
+			raise TypeError("\nTypeError: expected int")
+	else:
+		iterator = iter(iterable)
+
+	if offsets:
+		return list(_enumerate_offsets(iterable, start))
+
+	if columnar:
+		# Counts are start, start + 1, ... - a CustomRange instead of a column
+		(values,) = _columns(((i,) for i in iterator), 1)
+
+		return Columns([CustomRange(start, start + len(values)), values])
+
+	# A cheap type check first, a memoryview is only built for buffer inputs
+	view = _buffer_view(iterable) if type(iterable) in _buffer_types else None
+
+	if view is not None:
+		# Length of a buffer is known, result list is preallocated and filled by index
+		result_list = [None] * len(view)
+		position = 0
+
+		for i in view:
+			result_list[position] = (start, i)
+
+			start += 1
+			position += 1
+
+		return result_list
 
 	result_list = []
 
-	for i in range(len(iterable)):
-		result_list.append(tuple([start, iterable[i]]))
+	for i in iterator:
+		result_list.append(tuple([start, i]))
 
 		start += 1
 
 	return result_list
 
-def custom_enumerate_generator(iterable: typing.Iterable[int], start: int = 0) -> typing.Generator[list, None, None]:
+def _enumerate_offsets(source: typing.Any, start: int) -> typing.Generator[tuple, None, None]:
+	""" Yield (index, byte offset, record) of source with iter_offsets() method """
+
+	if not hasattr(source, "iter_offsets"):
+		raise TypeError("\nTypeError: expected source with byte offsets (MappedRecords, MappedLines)")
+
+	for offset, record in source.iter_offsets():
+		yield (start, offset, record)
+
+		start += 1
+
+@_instrumented_generator
+def custom_enumerate_generator(iterable: typing.Iterable[int], start: int = 0, validate: bool = True, offsets: bool = False, checkpoint: typing.Optional["Checkpoint"] = None, resume_from: typing.Any = None) -> typing.Generator[list, None, None]:
 	""" Implementing built-in enumerate generator function through using yield """
 
-	if not isinstance(iterable, typing.Iterable):
-		raise TypeError("\nTypeError: expected iterable object")
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
 
-	if not isinstance(start, int):
-		raise TypeError("\nTypeError: expected int object")
+		if not isinstance(start, int):
+			raise TypeError("\nTypeError: expected int object")
+	else:
+		iterator = iter(iterable)
 
-	if not iterable:
-		raise ValueError("\nValueError: expected not empty object")
+	if checkpoint is not None or resume_from is not None:
+		if offsets:
+			raise ValueError("\nValueError: expected checkpoint without offsets")
 
-	result_list = []
+		checkpoint = _checkpoint_arguments(checkpoint, resume_from)
+
+		if checkpoint.count is None:
+			checkpoint.count = start + checkpoint.offset
+
+		for i in _resumed_iterator(iterable, iterator, checkpoint.offset):
+			checkpoint.offset += 1
+			checkpoint.count += 1
+
+			yield (checkpoint.count - 1, i)
+
+		return None
 
-	for i in range(len(iterable)):
-		result_list.append(tuple([start, iterable[i]]))
+	if offsets:
+		yield from _enumerate_offsets(iterable, start)
 
-		yield result_list[i]
+		return None
+
+	# Streaming mode: yielded items are not kept, state is O(1)
+	for i in iterator:
+		yield tuple([start, i])
 
 		start += 1
 
 	return None
 
+"""
+	---------- Implementing any, all, sum, min and max ----------
+
+	any(iterable, /)
+		Return True if bool(x) is True for any x in the iterable.
+
+		If the iterable is empty, return False.
+
+	all(iterable, /)
+		Return True if bool(x) is True for all values x in the iterable.
+
+		If the iterable is empty, return True.
+
+	sum(iterable, /, start=0)
+		Return the sum of a 'start' value (default: 0) plus an iterable of numbers
+
+		When the iterable is empty, return the start value.
+		This function is intended specifically for use with numeric values and may
+		reject non-numeric types.
+
+	min(iterable, *[, default=obj, key=func]) -> value
+	min(arg1, arg2, *args, *[, key=func]) -> value
+
+		With a single iterable argument, return its smallest item. The
+		default keyword-only argument specifies an object to return if
+		the provided iterable is empty.
+		With two or more positional arguments, return the smallest argument.
+
+	max(...) is the same with the largest item.
+
+	----------------------------------------------------------------------------------------------------
+
+	Functions named custom_any, custom_all, custom_sum, custom_min and custom_max that replicate
+	the behavior of the built-in functions in one pass over the iterable:
+
+	* custom_any and custom_all stop at the first decisive item, the rest is not read
+	* custom_sum adds ints exactly and floats without rounding errors like math.fsum,
+	  other values (Fraction, Decimal, objects with __add__) are added with + like built-in sum
+	* custom_min and custom_max call key once per item
+
+	Example:
+
+	# Example usage of custom_any over a generator, stops at the first invalid record
+	has_invalid = custom_any(custom_map_generator(is_invalid, records))
+
+	print(custom_sum([0.1] * 10))  # Output: 1.0
+	print(custom_max(['apple', 'banana', 'cherry'], key=len))  # Output: banana
+"""
+
+def custom_any(iterable: typing.Iterable[typing.Any], validate: bool = True) -> bool:
+	""" Implementing built-in any function """
+
+	iterator = _iterator(iterable, "\nTypeError: expected iterable object") if validate else iter(iterable)
+
+	for i in iterator:
+		if i:
+			return True
+
+	return False
+
+def custom_all(iterable: typing.Iterable[typing.Any], validate: bool = True) -> bool:
+	""" Implementing built-in all function """
+
+	iterator = _iterator(iterable, "\nTypeError: expected iterable object") if validate else iter(iterable)
+
+	for i in iterator:
+		if not i:
+			return False
+
+	return True
+
+def custom_sum(iterable: typing.Iterable[int], start: typing.Any = 0, validate: bool = True) -> typing.Any:
+	""" Implementing built-in sum function """
+
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object with number values")
+
+		if isinstance(start, (str, bytes, bytearray)):
+			raise TypeError("\nTypeError: sum() can't sum strings [use ''.join(seq) instead]")
+	else:
+		iterator = iter(iterable)
+
+	if type(start) not in (int, bool, float):
+		for i in iterator:
+			start = start + i
+
+		return start
+
+	# ints are added to integer exactly, floats are kept as non-overlapping partials (math.fsum algorithm)
+	integer = 0 if type(start) is float else start
+	partials = []
+	special = None # inf or nan, finite partials do not change it
+
+	if type(start) is float:
+		# A float start follows the same inf and nan rules as the items
+		special = _add_partial(partials, start, None)
+
+	for i in iterator:
+		kind = type(i)
+
+		if kind is int or kind is bool:
+			integer += i
+		elif kind is float:
+			special = _add_partial(partials, i, special)
+		else:
+			# The rest is added with + like built-in sum
+			total = _partials_total(integer, partials, special) + i
+
+			for j in iterator:
+				total = total + j
+
+			return total
+
+	return _partials_total(integer, partials, special)
+
+def _add_partial(partials: list, x: float, special: typing.Optional[float]) -> typing.Optional[float]:
+	""" Add x to partials without rounding errors, return inf or nan total of not finite values """
+
+	if not math.isfinite(x):
+		return x if special is None else special + x
+
+	position = 0
+
+	for y in partials:
+		if abs(x) < abs(y):
+			x, y = y, x
+
+		high = x + y
+
+		if not math.isfinite(high):
+			# Like built-in sum, overflow of float addition gives inf
+			return high if special is None else special + high
+
+		low = y - (high - x)
+
+		if low:
+			partials[position] = low
+			position += 1
+
+		x = high
+
+	partials[position:] = [x]
+
+	return special
+
+def _partials_total(integer: int, partials: list, special: typing.Optional[float]) -> typing.Union[int, float]:
+	""" Total of integer and float partials, int if there were no floats """
+
+	if special is not None:
+		return special
+
+	if not partials:
+		return integer
+
+	# integer is split into floats that represent it exactly, fsum rounds the total once
+	while integer:
+		partials.append(float(integer))
+		integer -= int(partials[-1])
+
+	return math.fsum(partials)
+
+def _extremum(name: str, args: tuple, key: typing.Optional[typing.Callable], default: typing.Any, validate: bool, better: typing.Callable[[typing.Any, typing.Any], bool]) -> typing.Any:
+	""" Return the first item of args (one iterable or several values) for which no later item is better """
+
+	if len(args) == 1:
+		items = _iterator(args[0], "\nTypeError: expected iterable object") if validate else iter(args[0])
+	else:
+		if validate and not args:
+			raise TypeError(f"\nTypeError: {name} expected at least 1 argument, got 0")
+
+		if default is not _missing:
+			raise TypeError(f"\nTypeError: Cannot specify a default for {name}() with multiple positional arguments")
+
+		items = iter(args)
+
+	if validate and key is not None and not callable(key):
+		raise TypeError("\nTypeError: expected function(item) -> value or None")
+
+	result = next(items, _missing)
+
+	if result is _missing:
+		if default is _missing:
+			raise ValueError(f"\nValueError: {name}() arg is an empty sequence")
+
+		return default
+
+	if key is None:
+		for i in items:
+			if better(i, result):
+				result = i
+
+		return result
+
+	result_key = key(result)
+
+	for i in items:
+		i_key = key(i)
+
+		if better(i_key, result_key):
+			result, result_key = i, i_key
+
+	return result
+
+def custom_min(*args: typing.Any, key: typing.Optional[typing.Callable] = None, default: typing.Any = _missing, validate: bool = True) -> typing.Any:
+	""" Implementing built-in min function """
+
+	return _extremum("min", args, key, default, validate, operator.lt)
+
+def custom_max(*args: typing.Any, key: typing.Optional[typing.Callable] = None, default: typing.Any = _missing, validate: bool = True) -> typing.Any:
+	""" Implementing built-in max function """
+
+	return _extremum("max", args, key, default, validate, operator.gt)
+
+"""
+	---------- Implementing sorted ----------
+
+	sorted(iterable, /, *, key=None, reverse=False)
+		Return a new list containing all items from the iterable in ascending order.
+
+		A custom key function can be supplied to customize the sort order, and the
+		reverse flag can be set to request the result in descending order.
+
+	----------------------------------------------------------------------------------------------------
+
+	Function named custom_sorted that replicates the behavior of the built-in sorted function
+	and sorts data larger than memory with max_memory = N (most items held in memory at once):
+
+	* input of fewer than N items is sorted in memory
+	* otherwise sorted runs of N items are written to temporary files (pickle) and merged
+	  lazily by heapq.merge, at most 64 runs at once (more runs are merged in several passes)
+
+	With max_memory a generator is returned, so custom_sorted can take and feed other
+	custom_*_generator functions. Equal items keep their input order (stable) like sorted().
+
+	custom_merge(*sorted_iterables, key = None) lazily merges already sorted iterables
+	(for example sorted shards) like heapq.merge: O(n log k) time and O(k) memory for k iterables.
+
+	Example:
+
+	# Example usage of custom_sorted over a stream larger than memory
+	events = custom_sorted(read_events(), key=event_time, max_memory=1000000)
+
+	for event in custom_filter_generator(is_late, events):
+		...
+"""
+
+_merge_fan_in = 64 # runs merged at once
+
+def custom_sorted(iterable: typing.Iterable[typing.Any], key: typing.Optional[typing.Callable] = None, reverse: bool = False, max_memory: typing.Optional[int] = None, validate: bool = True) -> typing.Union[list, typing.Generator]:
+	""" Implementing built-in sorted function """
+
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
+
+		if key is not None and not callable(key):
+			raise TypeError("\nTypeError: expected function(item) -> value or None")
+
+		if not isinstance(reverse, bool):
+			raise TypeError("\nTypeError: expected bool")
+
+		if max_memory is not None:
+			if not isinstance(max_memory, int) or isinstance(max_memory, bool):
+				raise TypeError("\nTypeError: expected int object or None")
+
+			if max_memory < 1:
+				raise ValueError("\nValueError: expected positive int max_memory or None")
+	else:
+		iterator = iter(iterable)
+
+	if max_memory is None:
+		sorted_list = list(iterator)
+		sorted_list.sort(key = key, reverse = reverse)
+
+		return sorted_list
+
+	return _external_sorted(iterator, key, reverse, max_memory)
+
+def _external_sorted(iterator: typing.Iterator, key: typing.Optional[typing.Callable], reverse: bool, max_memory: int) -> typing.Generator:
+	""" Yield items of iterator sorted in memory or through runs in temporary files """
+
+	import heapq
+
+	# With key runs keep (key, item) records, so key is called once per item and only keys are compared
+	record_key = None if key is None else operator.itemgetter(0)
+	block = max(1, min(256, max_memory // _merge_fan_in)) # items per pickle of a run, one block per run is read at once
+
+	runs = []
+
+	try:
+		for chunk in _chunks(iterator, max_memory):
+			if key is not None:
+				chunk = [(key(i), i) for i in chunk]
+
+			chunk.sort(key = record_key, reverse = reverse)
+
+			if not runs and len(chunk) < max_memory:
+				# The input ended before max_memory items, all items fit in memory.
+				# An input of exactly max_memory items is written too: telling it from a longer
+				# one would take one more item in memory than max_memory allows
+				for record in chunk:
+					yield record if key is None else record[1]
+
+				return None
+
+			runs.append(_write_run(chunk, block))
+
+			chunk.clear()
+
+		while len(runs) > _merge_fan_in:
+			# Neighbour runs are merged, so equal items keep their input order
+			merged = []
+
+			for position in range(0, len(runs), _merge_fan_in):
+				group = runs[position : position + _merge_fan_in]
+
+				merged.append(_write_run(heapq.merge(*[_read_run(run) for run in group], key = record_key, reverse = reverse), block))
+
+				for run in group:
+					run.close()
+
+			runs = merged
+
+		for record in heapq.merge(*[_read_run(run) for run in runs], key = record_key, reverse = reverse):
+			yield record if key is None else record[1]
+	finally:
+		# Temporary files are deleted on close, also when the consumer stopped early
+		for run in runs:
+			run.close()
+
+	return None
+
+def _write_run(records: typing.Iterable, block: int) -> typing.BinaryIO:
+	""" Write records to a temporary file as pickled lists of block records """
+
+	import pickle, tempfile
+
+	run = tempfile.TemporaryFile()
+
+	for chunk in _chunks(iter(records), block):
+		pickle.dump(chunk, run, pickle.HIGHEST_PROTOCOL)
+
+	run.seek(0)
+
+	return run
+
+def _read_run(run: typing.BinaryIO) -> typing.Generator:
+	""" Yield records of a run written by _write_run """
+
+	import pickle
+
+	while True:
+		try:
+			chunk = pickle.load(run)
+		except EOFError:
+			return None
+
+		yield from chunk
+
+def custom_merge(*iterables: typing.Iterable[typing.Any], key: typing.Optional[typing.Callable] = None, validate: bool = True) -> typing.Generator:
+	""" Implementing heapq.merge function: yield items of sorted iterables in sorted order through using yield """
+
+	if validate:
+		iterators = _iterators(iterables, "\nTypeError: expected iterable objects")
+
+		if key is not None and not callable(key):
+			raise TypeError("\nTypeError: expected function(item) -> value or None")
+	else:
+		iterators = [iter(i) for i in iterables]
+
+	import heapq
+
+	# Heap of [key, order, item, iterator] - one entry per not exhausted iterable,
+	# order of the iterable breaks ties, so equal items keep the input order and items are not compared
+	heap = []
+
+	for order, j in enumerate(iterators):
+		item = next(j, _missing)
+
+		if item is not _missing:
+			heap.append([item if key is None else key(item), order, item, j])
+
+	heapq.heapify(heap)
+
+	while len(heap) > 1:
+		entry = heap[0]
+
+		yield entry[2]
+
+		item = next(entry[3], _missing)
+
+		if item is _missing:
+			heapq.heappop(heap)
+		else:
+			entry[0] = item if key is None else key(item)
+			entry[2] = item
+
+			heapq.heapreplace(heap, entry)
+
+	if heap:
+		# The last iterable is yielded without the heap
+		_, _, item, j = heap[0]
+
+		yield item
+		yield from j
+
+	return None
+
+"""
+	---------- Windows, groups and chunks ----------
+
+	Streaming operators in the style of the generator functions above, memory is O(window)
+	for unbounded iterables:
+
+	* custom_window(iterable, size, step = 1) - tuples of size items, every step items:
+	  step = 1 - sliding, step = size - tumbling, step > size - hopping windows,
+	  only the last size items are kept in a collections.deque
+	* custom_groupby(iterable, key = None) - like itertools.groupby, (key, group) of consecutive
+	  items with equal key(item), group is a generator over the shared iterator
+	  (a group is not available after moving to the next one)
+	* custom_chunked(iterable, size) - lists of size items, the last one can be shorter
+
+	Example:
+
+	# Rolling average of 3 values
+	for window in custom_window(values, 3):
+		print(custom_sum(window) / 3)
+
+	print(list(custom_window([1, 2, 3, 4, 5], 2, 2)))  # Output: [(1, 2), (3, 4)]
+	print([(key, list(group)) for key, group in custom_groupby('aabbb')])  # Output: [('a', ['a', 'a']), ('b', ['b', 'b', 'b'])]
+	print(list(custom_chunked([1, 2, 3, 4, 5], 2)))  # Output: [[1, 2], [3, 4], [5]]
+"""
+
+def custom_window(iterable: typing.Iterable[typing.Any], size: int, step: int = 1, validate: bool = True) -> typing.Generator[tuple, None, None]:
+	""" Yield windows of size items of iterable every step items through using yield """
+
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
+
+		if not isinstance(size, int) or isinstance(size, bool):
+			raise TypeError("\nTypeError: expected int object")
+
+		if size < 1:
+			raise ValueError("\nValueError: expected positive int size")
+
+		if not isinstance(step, int) or isinstance(step, bool):
+			raise TypeError("\nTypeError: expected int object")
+
+		if step < 1:
+			raise ValueError("\nValueError: expected positive int step")
+	else:
+		iterator = iter(iterable)
+
+	window = collections.deque(maxlen = size) # the oldest item is dropped by append
+	countdown = size # items until the next window
+
+	for i in iterator:
+		window.append(i)
+		countdown -= 1
+
+		if not countdown:
+			yield tuple(window)
+
+			countdown = step
+
+	return None
+
+def custom_groupby(iterable: typing.Iterable[typing.Any], key: typing.Optional[typing.Callable] = None, validate: bool = True) -> typing.Generator[tuple, None, None]:
+	""" Yield (key, group generator) of consecutive items with equal key through using yield """
+
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
+
+		if key is not None and not callable(key):
+			raise TypeError("\nTypeError: expected function(item) -> value or None")
+	else:
+		iterator = iter(iterable)
+
+	# Current item and its key are shared by the groups, the next group starts at the first item with other key
+	current = next(iterator, _missing)
+
+	if current is _missing:
+		return None
+
+	current_key = current if key is None else key(current)
+	exhausted = False
+
+	def group(target_key):
+		nonlocal current, current_key, exhausted
+
+		yield current
+
+		for current in iterator:
+			current_key = current if key is None else key(current)
+
+			if current_key != target_key:
+				return None
+
+			yield current
+
+		exhausted = True
+
+	while not exhausted:
+		target_key = current_key
+		items = group(target_key)
+
+		yield current_key, items
+
+		# Not consumed items of the group are skipped
+		if current_key == target_key:
+			for _ in items:
+				pass
+
+	return None
+
+def custom_chunked(iterable: typing.Iterable[typing.Any], size: int, validate: bool = True) -> typing.Generator[list, None, None]:
+	""" Yield lists of size items of iterable through using yield """
+
+	if validate:
+		iterator = _iterator(iterable, "\nTypeError: expected iterable object")
+
+		if not isinstance(size, int) or isinstance(size, bool):
+			raise TypeError("\nTypeError: expected int object")
+
+		if size < 1:
+			raise ValueError("\nValueError: expected positive int size")
+	else:
+		iterator = iter(iterable)
+
+	yield from _chunks(iterator, size)
+
+	return None
+
+"""
+	---------- Vectorized backends ----------
+
+	custom_map, custom_filter and custom_reduce take backend="python" (default) or "numpy".
+
+	With a vectorized backend a numeric one-dimensional array.array or memoryview
+	together with a known operation (operator.add, operator.mul, square, is_even) is computed
+	by one kernel call instead of the per-element Python loop. Other inputs, other functions,
+	possible int64 overflow or not installed NumPy fall back to the Python loop,
+	so the result is always the same as with backend="python".
+	numpy.ndarray inputs use the Python loop too: their items are NumPy scalars (int8 wraps
+	around on overflow, is_even rejects them), which an int64/float64 kernel would not reproduce.
+
+	Example:
+
+	numbers = array.array('q', [1, 2, 3, 4])
+
+	custom_map(square, numbers, backend="numpy") # Output: [1, 4, 9, 16]
+	custom_reduce(operator.add, numbers, backend="numpy") # Output: 10
+"""
+
+_backends = {}
+
+def register_backend(name: str, loader: typing.Callable[[], typing.Optional[dict]]) -> None:
+	"""
+		Register backend under name, loader is called once on first use and returns
+		table {(kind, function): kernel} with kind "map", "filter" or "reduce",
+		or None if the backend is not available. Kernel returns _missing to fall back to Python.
+	"""
+
+	if not isinstance(name, str):
+		raise TypeError("\nTypeError: expected str")
+
+	if not callable(loader):
+		raise TypeError("\nTypeError: expected callable object(function), () -> dict or None")
+
+	_backends[name] = [loader, _missing]
+
+def _backend_kernel(backend: str, kind: str, function: typing.Callable) -> typing.Optional[typing.Callable]:
+	""" Return kernel of backend for (kind, function) or None if the Python loop should be used """
+
+	if backend == "python":
+		return None
+
+	if backend not in _backends:
+		raise ValueError(f"\nValueError: expected one of backends {['python', *_backends]}")
+
+	entry = _backends[backend]
+
+	if entry[1] is _missing:
+		entry[1] = entry[0]()
+
+	if entry[1] is None:
+		return None
+
+	return entry[1].get((kind, function))
+
+def _numpy_kernels() -> typing.Optional[dict]:
+	""" Kernels table of "numpy" backend """
+
+	try:
+		import numpy
+	except ImportError:
+		return None
+
+	int64_limit = 2 ** 63
+
+	def as_array(iterable):
+		""" Return int64/float64 array for numeric buffer inputs, None for others """
+
+		# Not numpy.ndarray: the Python loop gets NumPy scalars from it, not int/float
+		if not isinstance(iterable, (array.array, memoryview)):
+			return None
+
+		try:
+			values = numpy.asarray(iterable)
+		except (TypeError, ValueError):
+			return None
+
+		if values.ndim != 1:
+			return None
+
+		# Python loop computes with int/float, so do the kernels
+		if values.dtype.kind == "i" or (values.dtype.kind == "u" and values.dtype.itemsize < 8):
+			return values.astype(numpy.int64)
+
+		if values.dtype.kind == "f":
+			return values.astype(numpy.float64)
+
+		return None
+
+	def bound(values):
+		""" Maximum absolute value of int array """
+
+		if not values.size:
+			return 0
+
+		return max(abs(int(values.max())), abs(int(values.min())))
+
+	def map_square(*iterables):
+		if len(iterables) != 1:
+			return _missing
+
+		values = as_array(iterables[0])
+
+		if values is None or (values.dtype.kind == "i" and bound(values) ** 2 >= int64_limit):
+			return _missing
+
+		with numpy.errstate(all="ignore"): # Python float gives inf/nan silently too
+			return (values * values).tolist()
+
+	def map_binary(ufunc, fits):
+		def kernel(*iterables):
+			if len(iterables) != 2:
+				return _missing
+
+			first, second = as_array(iterables[0]), as_array(iterables[1])
+
+			if first is None or second is None or first.dtype != second.dtype:
+				return _missing
+
+			length = min(len(first), len(second))
+			first, second = first[:length], second[:length]
+
+			if first.dtype.kind == "i" and not fits(bound(first), bound(second)):
+				return _missing
+
+			with numpy.errstate(all="ignore"): # Python float gives inf/nan silently too
+				return ufunc(first, second).tolist()
+
+		return kernel
+
+	def is_even_mask(iterable):
+		values = as_array(iterable)
+
+		if values is None or values.dtype.kind != "i":
+			return None
+
+		return values, (values & 1) == 0
+
+	def map_is_even(*iterables):
+		result = is_even_mask(iterables[0]) if len(iterables) == 1 else None
+
+		return _missing if result is None else result[1].tolist()
+
+	def filter_is_even(iterable):
+		result = is_even_mask(iterable)
+
+		return _missing if result is None else result[0][result[1]].tolist()
+
+	def reduce_kernel(ufunc, int_reduce, int_operator, fits):
+		def kernel(iterable, initial):
+			values = as_array(iterable)
+
+			# Empty input and errors are left to the Python loop
+			if values is None or not values.size:
+				return _missing
+
+			if values.dtype.kind == "i":
+				if initial is not _missing and not isinstance(initial, int):
+					return _missing
+
+				if not fits(bound(values), len(values)):
+					return _missing
+
+				value = int(int_reduce(values))
+
+				return value if initial is _missing else int_operator(initial, value)
+
+			if initial is not _missing:
+				if not isinstance(initial, float):
+					return _missing
+
+				values = numpy.concatenate(([initial], values))
+
+			# accumulate is a strict left fold, unlike pairwise reduce, so floats are equal
+			with numpy.errstate(all="ignore"): # Python float gives inf/nan silently too
+				return float(ufunc.accumulate(values)[-1])
+
+		return kernel
+
+	return {
+		("map", square): map_square,
+		("map", is_even): map_is_even,
+		("map", operator.add): map_binary(numpy.add, lambda a, b : a + b < int64_limit),
+		("map", operator.mul): map_binary(numpy.multiply, lambda a, b : a * b < int64_limit),
+		("filter", is_even): filter_is_even,
+		("reduce", operator.add): reduce_kernel(numpy.add, numpy.sum, operator.add, lambda b, n : b * n < int64_limit),
+		("reduce", operator.mul): reduce_kernel(numpy.multiply, numpy.prod, operator.mul, lambda b, n : b <= 1 or b.bit_length() * n < 63)
+	}
+
+register_backend("numpy", _numpy_kernels)
+
+"""
+	---------- Parallel execution ----------
+
+	custom_map, custom_filter and their generator variants take workers=N to run
+	the function on a concurrent.futures pool:
+
+	* chunksize - number of items sent to a worker at once (less overhead for cheap functions)
+	* executor - "process" (CPU-bound functions, function and items must be picklable) or "thread"
+	* ordered - results in input order (default) or in order of completion (faster, no waiting for slow chunks)
+
+	At most 2 * workers chunks are in flight, so the input is consumed lazily and generators keep backpressure.
+	An exception of the function is raised again by the caller with the original traceback
+	(for processes it is attached as __cause__ by concurrent.futures).
+
+	Example:
+
+	custom_map(square, range(10 ** 6), workers = 32, chunksize = 10 ** 4)
+"""
+
+def _parallel_arguments(workers: int, chunksize: int, executor: str, ordered: bool) -> None:
+	""" Validate parallel execution arguments """
+
+	if not isinstance(workers, int) or not isinstance(chunksize, int):
+		raise TypeError("\nTypeError: expected int object")
+
+	if workers < 1 or chunksize < 1:
+		raise ValueError("\nValueError: expected positive workers and chunksize")
+
+	if executor not in ("process", "thread"):
+		raise ValueError("\nValueError: expected executor \"process\" or \"thread\"")
+
+	if not isinstance(ordered, bool):
+		raise TypeError("\nTypeError: expected bool")
+
+def _chunks(iterator: typing.Iterator, size: int) -> typing.Generator[list, None, None]:
+	""" Yield lists of size items of iterator, the last one can be shorter """
+
+	while True:
+		chunk = []
+
+		for item in iterator:
+			chunk.append(item)
+
+			if len(chunk) == size:
+				break
+
+		if not chunk:
+			return None
+
+		yield chunk
+
+def _map_chunk(function: typing.Callable, chunk: list) -> list:
+	""" Apply function to every row of chunk, runs inside a worker """
+
+	return [function(*row) for row in chunk]
+
+def _filter_chunk(function: typing.Optional[typing.Callable], chunk: list) -> list:
+	""" Keep items of chunk for which function(item) is true, runs inside a worker """
+
+	if function is None:
+		return [i for i in chunk if i]
+
+	return [i for i in chunk if function(i)]
+
+def _parallel_chunks(chunk_function: typing.Callable, function: typing.Callable, items: typing.Iterator, workers: int, chunksize: int, executor: str, ordered: bool) -> typing.Generator:
+	""" Yield results of chunk_function(function, chunk) over chunks of items computed on a pool """
+
+	import concurrent.futures
+
+	pool_class = concurrent.futures.ProcessPoolExecutor if executor == "process" else concurrent.futures.ThreadPoolExecutor
+
+	with pool_class(max_workers = workers) as pool:
+		pending = collections.deque()
+
+		try:
+			for chunk in _chunks(items, chunksize):
+				pending.append(pool.submit(chunk_function, function, chunk))
+
+				if len(pending) >= 2 * workers:
+					yield from _completed_chunk(pending, ordered)
+
+			while pending:
+				yield from _completed_chunk(pending, ordered)
+		finally:
+			# Consumer stopped early or the function raised, not started chunks are dropped
+			for future in pending:
+				future.cancel()
+
+def _completed_chunk(pending: collections.deque, ordered: bool) -> list:
+	""" Remove a finished future from pending and return its result """
+
+	if ordered:
+		return pending.popleft().result()
+
+	import concurrent.futures
+
+	done, _ = concurrent.futures.wait(pending, return_when = concurrent.futures.FIRST_COMPLETED)
+	future = next(iter(done))
+
+	pending.remove(future)
+
+	return future.result()
+
+"""
+	---------- Associative reduce ----------
+
+	custom_reduce(..., associative = True) may group the calls in any way, for example
+	(a + b) + (c + d) instead of ((a + b) + c) + d, the order of items is kept (commutativity is not needed).
+
+	The input is split into chunks of chunksize items, each chunk is reduced separately
+	(on a pool with workers = N, same options as for custom_map) and the partial results
+	are combined in a balanced tree, initial is placed before the first item.
+
+	With pairwise = True every chunk is reduced as a balanced tree too, for float sums
+	it is pairwise summation with O(log n) error growth instead of O(n) of the left fold.
+
+	Example:
+
+	custom_reduce(operator.add, floats, associative = True, pairwise = True, workers = 32)
+"""
+
+def _tree_reduce(function: typing.Callable, values: typing.Iterable) -> typing.Any:
+	""" Reduce values as a balanced tree in O(log n) memory, return _missing for empty values """
+
+	stack = [] # [size, value] pairs, sizes are decreasing powers of two like digits of a binary counter
+
+	for value in values:
+		size = 1
+
+		while stack and stack[-1][0] == size:
+			value = function(stack.pop()[1], value)
+			size *= 2
+
+		stack.append([size, value])
+
+	if not stack:
+		return _missing
+
+	value = stack.pop()[1]
+
+	while stack:
+		value = function(stack.pop()[1], value)
+
+	return value
+
+def _reduce_chunk(function: typing.Callable, chunk: list, pairwise: bool = False) -> list:
+	""" Reduce not empty chunk, runs inside a worker, result is a list for _parallel_chunks """
+
+	if pairwise:
+		return [_tree_reduce(function, chunk)]
+
+	value = chunk[0]
+
+	for i in range(1, len(chunk)):
+		value = function(value, chunk[i])
+
+	return [value]
+
+def _associative_reduce(function: typing.Callable, iterator: typing.Iterator, initial: typing.Any, pairwise: bool, workers: typing.Optional[int], chunksize: typing.Optional[int], executor: str) -> typing.Any:
+	""" Reduce chunks separately and combine partial results in a balanced tree """
+
+	if chunksize is None:
+		chunksize = 2 ** 14
+
+	if workers is None:
+		_parallel_arguments(1, chunksize, executor, True)
+
+		partials = (_reduce_chunk(function, chunk, pairwise)[0] for chunk in _chunks(iterator, chunksize))
+	else:
+		_parallel_arguments(workers, chunksize, executor, True)
+
+		chunk_function = functools.partial(_reduce_chunk, pairwise = pairwise)
+		partials = _parallel_chunks(chunk_function, function, iterator, workers, chunksize, executor, True)
+
+	value = _tree_reduce(function, partials)
+
+	if value is _missing:
+		if initial is _missing:
+			raise TypeError("\nTypeError: reduce() of empty iterable with no initial value")
+
+		return initial
+
+	return value if initial is _missing else function(initial, value)
+
+"""
+	---------- Asyncio variants ----------
+
+	async_map, async_filter, async_zip and async_enumerate are async generators
+	with the behavior of custom_map_generator, custom_filter_generator,
+	custom_zip_generator and custom_enumerate_generator.
+
+	* Inputs can be async iterables or ordinary iterables.
+	* function can be a coroutine function or an ordinary function.
+	* concurrency - maximum number of function calls awaited at the same time,
+	  results are yielded in input order and the input is not read further ahead,
+	  so a slow consumer slows down the source (backpressure).
+
+	Example:
+
+	async for record in async_map(enrich, records_source, concurrency = 16):
+		...
+"""
+
+def _async_arguments(iterables: tuple, concurrency: int) -> None:
+	""" Validate async variants arguments """
+
+	if not all(isinstance(i, (collections.abc.Iterable, collections.abc.AsyncIterable)) for i in iterables):
+		raise TypeError("\nTypeError: expected iterable or async iterable objects")
+
+	if not isinstance(concurrency, int):
+		raise TypeError("\nTypeError: expected int object")
+
+	if concurrency < 1:
+		raise ValueError("\nValueError: expected positive concurrency")
+
+async def _async_items(iterable: typing.Union[typing.Iterable, typing.AsyncIterable]) -> typing.AsyncGenerator:
+	""" Yield items of async or ordinary iterable """
+
+	if isinstance(iterable, collections.abc.AsyncIterable):
+		async for i in iterable:
+			yield i
+	else:
+		for i in iterable:
+			yield i
+
+async def _async_zip_iterators(iterables: tuple, strict: bool = False) -> typing.AsyncGenerator:
+	""" Async version of _zip_iterators """
+
+	iterators = [_async_items(i) for i in iterables]
+
+	if not iterators:
+		return
+
+	try:
+		while True:
+			tmp_iterables = []
+
+			for position, j in enumerate(iterators):
+				item = await anext(j, _missing)
+
+				if item is _missing:
+					if strict:
+						if position:
+							raise ValueError("\nValueError: expected all iterables equal length")
+
+						for k in iterators[1:]:
+							if await anext(k, _missing) is not _missing:
+								raise ValueError("\nValueError: expected all iterables equal length")
+
+					return
+
+				tmp_iterables.append(item)
+
+			yield tuple(tmp_iterables)
+	finally:
+		for j in iterators:
+			await j.aclose()
+
+async def _async_call(function: typing.Callable, args: tuple) -> typing.Any:
+	""" Call function and await the result if it is awaitable """
+
+	import inspect
+
+	result = function(*args)
+
+	if inspect.isawaitable(result):
+		result = await result
+
+	return result
+
+async def _async_ordered_calls(function: typing.Callable, rows: typing.AsyncIterator, concurrency: int) -> typing.AsyncGenerator:
+	""" Yield (row, function(*row)) in input order with at most concurrency calls in flight """
+
+	import asyncio
+
+	pending = collections.deque()
+
+	try:
+		async for row in rows:
+			pending.append((row, asyncio.ensure_future(_async_call(function, row))))
+
+			if len(pending) >= concurrency:
+				row, task = pending.popleft()
+				yield row, await task
+
+		while pending:
+			row, task = pending.popleft()
+			yield row, await task
+	finally:
+		# Consumer stopped early or the function raised, not finished calls are cancelled
+		for _, task in pending:
+			task.cancel()
+
+async def async_map(function: typing.Callable[[int], typing.Any], *iterables: typing.Union[typing.Iterable[int], typing.AsyncIterable[int]], concurrency: int = 1) -> typing.AsyncGenerator:
+	""" Implementing built-in map for async iterables and coroutine functions """
+
+	if not callable(function):
+		raise TypeError("\nTypeError: expected function(int) -> int")
+
+	if not iterables:
+		raise TypeError("\nTypeError: expected at least one iterable object")
+
+	_async_arguments(iterables, concurrency)
+
+	async for _, result in _async_ordered_calls(function, _async_zip_iterators(iterables), concurrency):
+		yield result
+
+async def async_filter(function: typing.Optional[typing.Callable[[int], typing.Any]], iterable: typing.Union[typing.Iterable[int], typing.AsyncIterable[int]], concurrency: int = 1) -> typing.AsyncGenerator:
+	""" Implementing built-in filter for async iterables and coroutine functions """
+
+	if not callable(function) and function is not None:
+		raise TypeError("\nTypeError: expected function(int) -> bool or None")
+
+	_async_arguments((iterable,), concurrency)
+
+	if function is None:
+		function = lambda x : x
+
+	async for row, result in _async_ordered_calls(function, _async_zip_iterators((iterable,)), concurrency):
+		if result:
+			yield row[0]
+
+async def async_zip(*iterables: typing.Union[typing.Iterable[int], typing.AsyncIterable[int]], strict: bool = False) -> typing.AsyncGenerator:
+	""" Implementing built-in zip for async iterables """
+
+	if not isinstance(strict, bool):
+		raise TypeError("\nTypeError: expected bool")
+
+	_async_arguments(iterables, 1)
+
+	async for row in _async_zip_iterators(iterables, strict):
+		yield row
+
+async def async_enumerate(iterable: typing.Union[typing.Iterable[int], typing.AsyncIterable[int]], start: int = 0) -> typing.AsyncGenerator:
+	""" Implementing built-in enumerate for async iterables """
+
+	if not isinstance(start, int):
+		raise TypeError("\nTypeError: expected int object")
+
+	_async_arguments((iterable,), 1)
+
+	async for i in _async_items(iterable):
+		yield tuple([start, i])
+
+		start += 1
+
+"""
+	---------- Pipeline ----------
+
+	Pipeline(iterable).filter(f).map(g).enumerate().reduce(h) is the same as
+
+	custom_reduce(h, custom_enumerate_generator(custom_map_generator(g, custom_filter_generator(f, iterable))))
+
+	but all stages are fused into one loop: for every stages layout one function is generated
+	(and cached) with the stages inlined, so there is no generator frame or list per stage.
+	filter/map/enumerate return a new Pipeline, nothing runs until a terminal operation:
+	iteration, to_list() or reduce().
+
+	Example:
+
+	Pipeline(records).filter(is_valid).map(parse).enumerate(1).to_list()
+"""
+
+@functools.lru_cache(maxsize = None)
+def _fused_function(kinds: tuple, terminal: str) -> typing.Callable:
+	""" Generate function with stages of kinds inlined into one loop, terminal is "iterate" or "reduce" """
+
+	lines = ["def fused(source, args, function, value):"]
+
+	for n, kind in enumerate(kinds):
+		# Stage arguments become locals: function of filter/map, counter of enumerate
+		lines.append(f"\tstage_{n} = args[{n}]")
+
+	lines.append("\tfor item in source:")
+
+	for n, kind in enumerate(kinds):
+		if kind == "filter":
+			lines.append(f"\t\tif not stage_{n}(item):")
+			lines.append("\t\t\tcontinue")
+		elif kind == "map":
+			lines.append(f"\t\titem = stage_{n}(item)")
+		else:
+			lines.append(f"\t\titem = (stage_{n}, item)")
+			lines.append(f"\t\tstage_{n} += 1")
+
+	if terminal == "iterate":
+		lines.append("\t\tyield item")
+	else:
+		lines.append("\t\tvalue = item if value is missing else function(value, item)")
+		lines.append("\treturn value")
+
+	namespace = {"missing": _missing}
+
+	exec("\n".join(lines), namespace)
+
+	return namespace["fused"]
+
+class Pipeline:
+	""" Lazy chain of filter/map/enumerate stages fused into one loop """
+
+	__slots__ = ("_source", "_kinds", "_args")
+
+	def __init__(self, iterable: typing.Iterable[int]) -> None:
+		_iterator(iterable, "\nTypeError: expected iterable object")
+
+		self._source = iterable
+		self._kinds = ()
+		self._args = ()
+
+	def _stage(self, kind: str, arg: typing.Any) -> "Pipeline":
+		""" Return new Pipeline with stage added, self is not changed """
+
+		pipeline = Pipeline.__new__(Pipeline)
+
+		pipeline._source = self._source
+		pipeline._kinds = self._kinds + (kind,)
+		pipeline._args = self._args + (arg,)
+
+		return pipeline
+
+	def __repr__(self) -> str:
+		return f"Pipeline({self._source!r}){''.join(f'.{kind}()' for kind in self._kinds)}"
+
+	def filter(self, function: typing.Optional[typing.Callable[[int], bool]] = None) -> "Pipeline":
+		""" Keep items for which function(item) is true, like custom_filter_generator """
+
+		if not callable(function) and function is not None:
+			raise TypeError("\nTypeError: expected function(int) -> bool or None")
+
+		# filter(None) keeps true items, bool() gives the same check
+		return self._stage("filter", bool if function is None else function)
+
+	def map(self, function: typing.Callable[[int], int]) -> "Pipeline":
+		""" Replace items with function(item), like custom_map_generator """
+
+		if not callable(function):
+			raise TypeError("\nTypeError: expected function(int) -> int")
+
+		return self._stage("map", function)
+
+	def enumerate(self, start: int = 0) -> "Pipeline":
+		""" Replace items with (count, item) tuples, like custom_enumerate_generator """
+
+		if not isinstance(start, int):
+			raise TypeError("\nTypeError: expected int object")
+
+		return self._stage("enumerate", start)
+
+	def __iter__(self) -> typing.Iterator:
+		return _fused_function(self._kinds, "iterate")(self._source, self._args, None, _missing)
+
+	def to_list(self) -> list:
+		""" Run the pipeline and return list of results """
+
+		return list(self)
+
+	def reduce(self, function: typing.Callable[[int, int], int], initial: typing.Any = _missing) -> typing.Any:
+		""" Run the pipeline and reduce results, like custom_reduce """
+
+		if not callable(function):
+			raise TypeError("\nTypeError: expected callable object(function), (int, int) -> int")
+
+		value = _fused_function(self._kinds, "reduce")(self._source, self._args, function, initial)
+
+		if value is _missing:
+			raise TypeError("\nTypeError: reduce() of empty iterable with no initial value")
+
+		return value
+
+"""
+	---------- Map cache ----------
+
+	custom_map and custom_map_generator take cache = N (MapCache with maxsize N) or a MapCache object,
+	repeated argument tuples reuse the result of the earlier function(*args) call.
+
+	MapCache(maxsize = 128, ttl = None, key = None)
+
+	* maxsize - number of kept results, the least recently used one is evicted (None - no limit)
+	* ttl - seconds a result is valid (None - forever)
+	* key - function(args) -> hashable key for unhashable arguments (for example repr),
+	  without it calls with unhashable arguments are not cached and counted in unhashable
+
+	stats() returns hits, misses, evictions, expirations and unhashable counters.
+	One MapCache can be shared by several calls and functions, keys include the function.
+
+	Example:
+
+	cache = MapCache(maxsize = 10000, ttl = 300)
+	custom_map(enrich, records, cache = cache)
+	cache.stats() # Output: {'hits': 8000, 'misses': 2000, ...}
+"""
+
+class MapCache:
+	""" LRU cache with optional TTL and hit/miss/eviction counters for results of map function """
+
+	__slots__ = ("maxsize", "ttl", "key", "clock", "hits", "misses", "evictions", "expirations", "unhashable", "_data")
+
+	def __init__(self, maxsize: typing.Optional[int] = 128, ttl: typing.Optional[float] = None, key: typing.Optional[typing.Callable[[tuple], typing.Hashable]] = None, clock: typing.Callable[[], float] = time.monotonic) -> None:
+		if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 1):
+			raise ValueError("\nValueError: expected positive int maxsize or None")
+
+		if ttl is not None and (not isinstance(ttl, (int, float)) or ttl <= 0):
+			raise ValueError("\nValueError: expected positive ttl or None")
+
+		if key is not None and not callable(key):
+			raise TypeError("\nTypeError: expected function(args) -> hashable or None")
+
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.key = key
+		self.clock = clock
+
+		self.hits = self.misses = self.evictions = self.expirations = self.unhashable = 0
+
+		self._data = collections.OrderedDict() # key -> (value, expiration time or None), the oldest first
+
+	def __repr__(self) -> str:
+		return f"MapCache(maxsize={self.maxsize}, ttl={self.ttl}, size={len(self._data)})"
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+	def call(self, function: typing.Callable, args: tuple, original: typing.Optional[typing.Callable] = None) -> typing.Any:
+		""" Return cached function(*args) or call function and cache the result, original - function of the key if not function """
+
+		key = (function if original is None else original, args if self.key is None else self.key(args))
+
+		try:
+			entry = self._data.get(key)
+		except TypeError:
+			self.unhashable += 1
+
+			return function(*args)
+
+		if entry is not None:
+			if entry[1] is None or entry[1] > self.clock():
+				self._data.move_to_end(key)
+				self.hits += 1
+
+				return entry[0]
+
+			del self._data[key]
+			self.expirations += 1
+
+		self.misses += 1
+
+		value = function(*args)
+
+		self._data[key] = (value, None if self.ttl is None else self.clock() + self.ttl)
+
+		if self.maxsize is not None and len(self._data) > self.maxsize:
+			self._data.popitem(last = False)
+			self.evictions += 1
+
+		return value
+
+	def stats(self) -> dict:
+		""" Return counters and size """
+
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"expirations": self.expirations,
+			"unhashable": self.unhashable,
+			"size": len(self._data),
+			"maxsize": self.maxsize
+		}
+
+	def clear(self) -> None:
+		""" Remove all results, counters are kept """
+
+		self._data.clear()
+
+def _cached_function(function: typing.Callable, cache: typing.Union[int, MapCache], workers: typing.Optional[int]) -> typing.Callable:
+	""" Return function that looks up results in cache before calling function """
+
+	if isinstance(cache, int) and not isinstance(cache, bool):
+		cache = MapCache(maxsize = cache)
+
+	if not isinstance(cache, MapCache):
+		raise TypeError("\nTypeError: expected int or MapCache object")
+
+	if workers is not None:
+		# Results of workers would not get back to the cache of this process
+		raise ValueError("\nValueError: expected cache without workers")
+
+	# Instrumentation times the user function, the key is made of the user function itself,
+	# so timing is added only to misses and results are shared with not measured calls
+	original = getattr(function, "__wrapped__", function)
+
+	def cached(*args):
+		return cache.call(function, args, original)
+
+	return cached
+
+"""
+	---------- Memory-mapped file sources ----------
+
+	MappedRecords(path, format) and MappedLines(path) expose a file as an iterable of records
+	read through mmap: the operating system loads pages on access, so files larger than memory
+	are scanned without readlines() and can be passed to any custom_* function.
+
+	* MappedRecords - fixed-width records of struct format ("<qd" -> (int, float) tuples,
+	  one field formats like "<q" -> values), len() and records[i] are O(1)
+	* MappedLines - newline-delimited lines as bytes without b"\n"
+
+	iter_offsets() yields (byte offset, record), custom_enumerate(source, offsets = True)
+	gives (index, byte offset, record) triples.
+
+	Example:
+
+	with MappedRecords("events.bin", "<qd") as events:
+		for event in custom_filter_generator(is_late, events):
+			...
+"""
+
+class _MappedFile:
+	""" Read-only mmap of a file, empty files are not mapped """
+
+	__slots__ = ("path", "_file", "_map")
+
+	def __init__(self, path: typing.Union[str, os.PathLike]) -> None:
+		self.path = path
+		self._file = open(path, "rb")
+
+		try:
+			if os.fstat(self._file.fileno()).st_size:
+				self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+			else:
+				self._map = b""
+		except BaseException:
+			self._file.close()
+			raise
+
+	def close(self) -> None:
+		""" Unmap and close the file """
+
+		if isinstance(self._map, mmap.mmap):
+			self._map.close()
+
+		self._file.close()
+
+	def __enter__(self) -> "_MappedFile":
+		return self
+
+	def __exit__(self, *exc_info: typing.Any) -> None:
+		self.close()
+
+class MappedRecords(_MappedFile):
+	""" Fixed-width struct records of a file through mmap """
+
+	__slots__ = ("format", "_struct", "_single")
+
+	def __init__(self, path: typing.Union[str, os.PathLike], format: str = "B") -> None:
+		if not isinstance(format, str):
+			raise TypeError("\nTypeError: expected struct format str")
+
+		self.format = format
+		self._struct = struct.Struct(format)
+		self._single = len(self._struct.unpack(bytes(self._struct.size))) == 1
+
+		super().__init__(path)
+
+	def __repr__(self) -> str:
+		return f"MappedRecords({self.path!r}, {self.format!r})"
+
+	def __len__(self) -> int:
+		return len(self._map) // self._struct.size
+
+	def __getitem__(self, index: int) -> typing.Any:
+		if not isinstance(index, int):
+			raise TypeError("\nTypeError: expected int index")
+
+		if index < 0:
+			index += len(self)
+
+		if not 0 <= index < len(self):
+			raise IndexError("\nIndexError: record index out of range")
+
+		record = self._struct.unpack_from(self._map, index * self._struct.size)
+
+		return record[0] if self._single else record
+
+	def iter_offsets(self, start: int = 0) -> typing.Generator[tuple, None, None]:
+		""" Yield (byte offset, record) from record index start """
+
+		size = self._struct.size
+		offset = start * size
+
+		for record in self.iter_from(start):
+			yield offset, record
+
+			offset += size
+
+	def __iter__(self) -> typing.Iterator:
+		return self.iter_from(0)
+
+	def iter_from(self, start: int) -> typing.Generator:
+		""" Yield records from record index start, unpacked from the map without copying """
+
+		# Every record is unpacked from the map itself: no memoryview is kept between yields,
+		# so the file can be closed while a paused generator still exists
+		unpack_from = self._struct.unpack_from
+		size = self._struct.size
+
+		for offset in range(start * size, len(self) * size, size):
+			record = unpack_from(self._map, offset)
+
+			yield record[0] if self._single else record
+
+class MappedLines(_MappedFile):
+	""" Newline-delimited lines of a file through mmap """
+
+	__slots__ = ()
+
+	def __repr__(self) -> str:
+		return f"MappedLines({self.path!r})"
+
+	def iter_offsets(self, start: int = 0) -> typing.Generator[tuple, None, None]:
+		""" Yield (byte offset, line) from byte offset start (beginning of a line) """
+
+		data = self._map
+		end = len(data)
+		position = start
+
+		while position < end:
+			newline = data.find(b"\n", position)
+
+			if newline == -1:
+				newline = end
+
+			yield position, data[position:newline]
+
+			position = newline + 1
+
+	def __iter__(self) -> typing.Iterator:
+		for _, line in self.iter_offsets():
+			yield line
+"""
+	---------- Instrumentation ----------
+
+	Inside "with Instrumentation() as metrics" every call of custom_filter, custom_map, custom_zip,
+	custom_reduce, custom_enumerate and their _generator variants is measured per function name:
+
+	* calls - number of calls
+	* elements - returned or yielded items (custom_reduce - input items)
+	* callbacks - calls of the user function (backend "python" without workers only)
+	* wall_time - seconds inside the function (for generators - inside next())
+	* callback_time - seconds inside the user function, framework_time = wall_time - callback_time
+	* peak_buffered - the most items held at once (result list, batch of a generator)
+
+	custom_* calls nested in a measured call (in the user function too) are counted in that call.
+	The active Instrumentation belongs to the current context (contextvars): calls of other threads
+	are not measured, a generator is measured when it was created inside the block, also if it
+	is consumed after it. Without an active Instrumentation the cost is one check per call,
+	nothing per element.
+
+	Example:
+
+	with Instrumentation() as metrics:
+		custom_map(enrich, records)
+
+	metrics.as_dict() # Output: {'custom_map': {'calls': 1, 'elements': 1000, ...}}
+	print(metrics.prometheus())
+"""
+
+_metric_descriptions = (
+	("calls", "calls_total", "counter", "Calls of the function"),
+	("elements", "elements_total", "counter", "Returned or yielded items"),
+	("callbacks", "callbacks_total", "counter", "Calls of the user function"),
+	("wall_time", "wall_seconds_total", "counter", "Seconds inside the function"),
+	("callback_time", "callback_seconds_total", "counter", "Seconds inside the user function"),
+	("framework_time", "framework_seconds_total", "counter", "Seconds outside the user function"),
+	("peak_buffered", "peak_buffered_items", "gauge", "The most items held at once")
+)
+
+class Instrumentation:
+	""" Per-function metrics of custom_* calls made while the context is active """
+
+	__slots__ = ("metrics", "_tokens")
+
+	def __init__(self) -> None:
+		self.metrics = {} # function name -> counters
+		self._tokens = [] # tokens of the entered contexts, the last one is reset first
+
+	def __repr__(self) -> str:
+		return f"Instrumentation(functions={sorted(self.metrics)})"
+
+	def __enter__(self) -> "Instrumentation":
+		self._tokens.append(_instrumentation.set(self))
+
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		_instrumentation.reset(self._tokens.pop())
+
+	def _record(self, function: typing.Callable, arguments: dict) -> dict:
+		""" Count the call and replace the user function in arguments with a timed one """
+
+		record = self.metrics.get(function.__name__)
+
+		if record is None:
+			record = self.metrics[function.__name__] = {name: 0 for name, *_ in _metric_descriptions if name != "framework_time"}
+
+		record["calls"] += 1
+
+		callback = arguments.get("function")
+
+		# Kernels of backends, workers and FilterIndex queries need the original function
+		if callable(callback) and type(callback) is not _IndexQuery and arguments.get("backend", "python") == "python" and arguments.get("workers") is None:
+			arguments["function"] = _timed_callback(callback, record)
+
+		return record
+
+	def call(self, function: typing.Callable, arguments: dict) -> typing.Any:
+		""" Measure function(**arguments), arguments are locals() of the beginning of function """
+
+		record = self._record(function, arguments)
+
+		if function is custom_reduce:
+			# Input items are counted, the user function is not timed for backends and workers
+			iterable = arguments["iterable"]
+
+			if isinstance(iterable, collections.abc.Sized):
+				record["elements"] += len(iterable)
+			else:
+				arguments["iterable"] = _counted(iterable, record)
+
+		args, kwargs = _call_arguments(function, arguments)
+
+		token = _instrumentation.set(None) # nested calls are a part of this call
+		started = time.perf_counter()
+
+		try:
+			result = function(*args, **kwargs)
+		finally:
+			record["wall_time"] += time.perf_counter() - started
+			_instrumentation.reset(token)
+
+		if function is custom_reduce:
+			pass
+		elif isinstance(result, _SequenceView):
+			record["elements"] += len(result) # items of views are built on access, nothing is buffered
+		else:
+			record["elements"] += len(result)
+			record["peak_buffered"] = max(record["peak_buffered"], len(result))
+
+		return result
+
+	def stream(self, function: typing.Callable, arguments: dict) -> typing.Generator[typing.Any, None, None]:
+		""" Return generator function(**arguments) measured by this object, only time inside next() is counted """
+
+		record = self._record(function, arguments)
+		args, kwargs = _call_arguments(function, arguments)
+
+		return self._measured(function(*args, **kwargs), record, arguments.get("batch_size") is not None)
+
+	def _measured(self, generator: typing.Generator, record: dict, batched: bool) -> typing.Generator[typing.Any, None, None]:
+		""" Yield items of generator, add time of next() and yielded items to record """
+
+		try:
+			while True:
+				token = _instrumentation.set(None)
+				started = time.perf_counter()
+
+				try:
+					item = next(generator, _missing)
+				finally:
+					record["wall_time"] += time.perf_counter() - started
+					_instrumentation.reset(token)
+
+				if item is _missing:
+					return None
+
+				count = len(item) if batched else 1
+
+				record["elements"] += count
+				record["peak_buffered"] = max(record["peak_buffered"], count)
+
+				yield item
+		finally:
+			generator.close()
+
+	def as_dict(self) -> dict:
+		""" Return metrics of every function with framework_time """
+
+		return {
+			name: dict(record, framework_time = record["wall_time"] - record["callback_time"])
+			for name, record in self.metrics.items()
+		}
+
+	def prometheus(self, prefix: str = "custom") -> str:
+		""" Return metrics in Prometheus text exposition format """
+
+		metrics = self.as_dict()
+		lines = []
+
+		for key, suffix, kind, description in _metric_descriptions:
+			lines.append(f"# HELP {prefix}_{suffix} {description}")
+			lines.append(f"# TYPE {prefix}_{suffix} {kind}")
+
+			for name, record in metrics.items():
+				lines.append(f"{prefix}_{suffix}{{function=\"{name}\"}} {record[key]}")
+
+		return "\n".join(lines) + "\n"
+
+	def reset(self) -> None:
+		""" Remove all metrics """
+
+		self.metrics.clear()
+
+def _timed_callback(function: typing.Callable, record: dict) -> typing.Callable:
+	""" Return function that adds its calls and time to record """
+
+	def timed(*args):
+		started = time.perf_counter()
+
+		try:
+			return function(*args)
+		finally:
+			record["callback_time"] += time.perf_counter() - started
+			record["callbacks"] += 1
+
+	timed.__wrapped__ = function # the cache keys results on the user function
+
+	return timed
+
+def _counted(iterable: typing.Iterable, record: dict) -> typing.Generator:
+	""" Yield items of iterable, add their number to record elements """
+
+	for i in iterable:
+		record["elements"] += 1
+
+		yield i
+
+@functools.lru_cache(maxsize = None)
+def _signature(function: typing.Callable) -> typing.Any:
+	""" inspect.Signature of function """
+
+	import inspect
+
+	return inspect.signature(function)
+
+def _bound_arguments(function: typing.Callable, args: tuple, kwargs: dict) -> dict:
+	""" Turn a call of function into a dict of all parameters, like locals() of its beginning """
+
+	bound = _signature(function).bind(*args, **kwargs)
+	bound.apply_defaults()
+
+	return dict(bound.arguments)
+
+@functools.lru_cache(maxsize = None)
+def _parameters(function: typing.Callable) -> tuple:
+	""" (name, kind name) of parameters of function """
+
+	return tuple((parameter.name, parameter.kind.name) for parameter in _signature(function).parameters.values())
+
+def _call_arguments(function: typing.Callable, arguments: dict) -> tuple:
+	""" Turn locals() of the beginning of function into (args, kwargs) for calling it again """
+
+	args, kwargs = [], {}
+
+	for name, kind in _parameters(function):
+		if kind == "VAR_POSITIONAL":
+			args.extend(arguments[name])
+		elif kind == "KEYWORD_ONLY":
+			kwargs[name] = arguments[name]
+		else:
+			args.append(arguments[name])
+
+	return args, kwargs
+
+"""
+	---------- Sequence views ----------
+
+	custom_enumerate(sequence, view = True) and custom_zip(*sequences, view = True) return
+	EnumerateView and ZipView: items are built on access from the sequences, nothing is copied.
+
+	len(), view[i], view[a:b:c] and reversed(view) are O(1), a slice is a view of the same
+	sequences with the original enumerate counts. Sequences must not change length while viewed.
+
+	Example:
+
+	rows = custom_enumerate(records, 1, view = True) # records has 5 000 000 items
+	page = list(rows[1000:1050]) # Output: [(1001, ...), ..., (1050, ...)]
+"""
+
+def _is_sequence(obj: typing.Any) -> bool:
+	""" Object with len() and indexing by int """
+
+	return hasattr(type(obj), "__len__") and hasattr(type(obj), "__getitem__") and not isinstance(obj, collections.abc.Mapping)
+
+class _SequenceView:
+	""" Items built from sequences at positions of a CustomRange """
+
+	__slots__ = ("_indices",)
+
+	def __len__(self) -> int:
+		return len(self._indices)
+
+	def __bool__(self) -> bool:
+		return bool(self._indices)
+
+	def __getitem__(self, key: typing.Union[int, slice]) -> typing.Any:
+		if isinstance(key, slice):
+			return self._view(self._indices[key])
+
+		return self._item(self._indices[key])
+
+	def __iter__(self) -> typing.Iterator:
+		item = self._item
+
+		for i in self._indices:
+			yield item(i)
+
+	def __reversed__(self) -> typing.Iterator:
+		item = self._item
+
+		for i in reversed(self._indices):
+			yield item(i)
+
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}({self._indices!r})"
+
+class EnumerateView(_SequenceView):
+	""" Lazy (count, item) pairs of a sequence """
+
+	__slots__ = ("_sequence", "_start")
+
+	def __init__(self, sequence: typing.Sequence, start: int = 0, indices: typing.Optional[CustomRange] = None) -> None:
+		if not _is_sequence(sequence):
+			raise TypeError("\nTypeError: expected sequence object")
+
+		if not isinstance(start, int):
+			raise TypeError("\nTypeError: expected int")
+
+		self._sequence = sequence
+		self._start = start
+		self._indices = CustomRange(len(sequence)) if indices is None else indices
+
+	def _item(self, i: int) -> tuple:
+		return (self._start + i, self._sequence[i])
+
+	def _view(self, indices: CustomRange) -> "EnumerateView":
+		return EnumerateView(self._sequence, self._start, indices)
+
+class ZipView(_SequenceView):
+	""" Lazy tuples of items of sequences at the same position """
+
+	__slots__ = ("_sequences",)
+
+	def __init__(self, *sequences: typing.Sequence, strict: bool = False, indices: typing.Optional[CustomRange] = None) -> None:
+		if not all(_is_sequence(i) for i in sequences):
+			raise TypeError("\nTypeError: expected sequence objects")
+
+		if not isinstance(strict, bool):
+			raise TypeError("\nTypeError: expected bool")
+
+		lengths = [len(i) for i in sequences]
+
+		if strict and len(set(lengths)) > 1:
+			raise ValueError("\nValueError: expected all iterables equal length")
+
+		self._sequences = sequences
+		self._indices = CustomRange(min(lengths, default = 0)) if indices is None else indices
+
+	def _item(self, i: int) -> tuple:
+		return tuple([sequence[i] for sequence in self._sequences])
+
+	def _view(self, indices: CustomRange) -> "ZipView":
+		return ZipView(*self._sequences, indices = indices)
+
+"""
+	---------- Filter index ----------
+
+	FilterIndex(iterable, key = None) is a list with indexes of key(item) for repeated
+	custom_filter and custom_filter_generator queries over the same data:
+
+	* index.equal(value) - predicate key(item) == value, answered by a hash index (dict of positions)
+	* index.between(low, high) - predicate low <= key(item) < high, answered by a sorted index
+	  through bisect in O(log n + k log k) for k found items
+
+	Indexes are built on the first query and dropped by every list mutation (append, item
+	assignment, sort, ...), the next query builds them again. Changes inside items are not seen.
+	The predicates are usual functions, for other iterables, workers or unhashable/unorderable
+	keys the items are checked one by one. Keys not equal to themselves (nan) are not indexed, they
+	never satisfy the predicates; a nan value or bound is checked one by one as well.
+	Results keep the order of the list.
+
+	Example:
+
+	by_status = FilterIndex(records, key = lambda record : record["status"])
+
+	failed = custom_filter(by_status.equal("failed"), by_status) # no scan after the first query
+	by_status.append(new_record) # indexes are rebuilt on the next query
+"""
+
+class FilterIndex(list):
+	""" List with lazy hash and sorted indexes of key(item) for custom_filter """
+
+	__slots__ = ("key", "_hash", "_keys", "_positions")
+
+	def __init__(self, iterable: typing.Iterable[typing.Any] = (), key: typing.Optional[typing.Callable] = None) -> None:
+		if key is not None and not callable(key):
+			raise TypeError("\nTypeError: expected function(item) -> value or None")
+
+		super().__init__(iterable)
+
+		self.key = key
+
+		self._invalidate()
+
+	def __repr__(self) -> str:
+		return f"FilterIndex({list.__repr__(self)})"
+
+	def _invalidate(self) -> None:
+		""" Drop indexes, they are built again by the next query """
+
+		self._hash = None # key -> ascending positions
+		self._keys = self._positions = None # sorted keys and positions of the items with them
+
+	def _keys_of_items(self) -> list:
+		return list(self) if self.key is None else [self.key(i) for i in self]
+
+	def equal(self, value: typing.Any) -> "_IndexQuery":
+		""" Return predicate key(item) == value answered by the hash index """
+
+		return _IndexQuery(self, value, _missing)
+
+	def between(self, low: typing.Any, high: typing.Any) -> "_IndexQuery":
+		""" Return predicate low <= key(item) < high answered by the sorted index """
+
+		return _IndexQuery(self, low, high)
+
+	def _equal_positions(self, value: typing.Any) -> typing.Optional[list]:
+		""" Positions of items with key equal to value, None for unhashable keys """
+
+		try:
+			if value != value:
+				# The dict would match nan by identity, the predicate never matches it
+				return None
+
+			if self._hash is None:
+				index = {}
+
+				for position, i in enumerate(self._keys_of_items()):
+					# Keys not equal to themselves (nan) never satisfy key == value, they are not indexed
+					if i == i:
+						index.setdefault(i, []).append(position)
+
+				self._hash = index
+
+			return self._hash.get(value, [])
+		except TypeError:
+			return None
+
+	def _between_positions(self, low: typing.Any, high: typing.Any) -> typing.Optional[list]:
+		""" Ascending positions of items with low <= key < high, None for unorderable keys """
+
+		import bisect
+
+		try:
+			if low != low or high != high:
+				return None
+
+			if self._keys is None:
+				keys = self._keys_of_items()
+				# Keys not equal to themselves (nan) are unordered and break bisect, they never satisfy
+				# low <= key < high, so they are left out of the sorted index
+				positions = sorted((i for i in range(len(keys)) if keys[i] == keys[i]), key = keys.__getitem__)
+
+				self._keys = [keys[i] for i in positions]
+				self._positions = positions
+
+			start = bisect.bisect_left(self._keys, low)
+			stop = bisect.bisect_left(self._keys, high, start)
+		except TypeError:
+			return None
+
+		return sorted(self._positions[start:stop])
+
+def _invalidating(name: str) -> typing.Callable:
+	""" Return list method name that drops indexes of FilterIndex before the change """
+
+	method = getattr(list, name)
+
+	def invalidating(self, *args, **kwargs):
+		self._invalidate()
+
+		return method(self, *args, **kwargs)
+
+	invalidating.__name__ = name
+
+	return invalidating
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse"):
+	setattr(FilterIndex, _name, _invalidating(_name))
+
+class _IndexQuery:
+	""" Predicate of FilterIndex.equal/between, custom_filter answers it by the index """
+
+	__slots__ = ("index", "low", "high")
+
+	def __init__(self, index: FilterIndex, low: typing.Any, high: typing.Any) -> None:
+		self.index = index
+		self.low = low
+		self.high = high # _missing for equal queries
+
+	def __repr__(self) -> str:
+		if self.high is _missing:
+			return f"FilterIndex.equal({self.low!r})"
+
+		return f"FilterIndex.between({self.low!r}, {self.high!r})"
+
+	def __call__(self, item: typing.Any) -> bool:
+		value = item if self.index.key is None else self.index.key(item)
+
+		if self.high is _missing:
+			return value == self.low
+
+		return self.low <= value < self.high
+
+	def positions(self) -> typing.Optional[list]:
+		""" Ascending positions of the found items, None if the index can not answer """
+
+		if self.high is _missing:
+			return self.index._equal_positions(self.low)
+
+		return self.index._between_positions(self.low, self.high)
+
+def _index_positions(function: typing.Any, iterable: typing.Any) -> typing.Optional[list]:
+	""" Positions of items for an index predicate over its own FilterIndex, otherwise None """
+
+	if type(function) is not _IndexQuery or function.index is not iterable:
+		return None
+
+	return function.positions()
+
+"""
+	---------- Columnar results ----------
+
+	custom_zip(*iterables, columnar = True) and custom_enumerate(iterable, columnar = True) return
+	Columns instead of a list of tuples: every position of the tuples is kept as one column,
+
+	* array.array('q') - column of ints (in int64 range)
+	* array.array('d') - column of floats
+	* list - other or mixed values
+	* CustomRange - counts of custom_enumerate, no memory per row
+
+	Rows are tuples built on access: len(), columns[i], columns[a:b], iteration and reversed().
+	An int row costs 8 bytes per column instead of a tuple (56+ bytes) and a list pointer.
+
+	Example:
+
+	rows = custom_enumerate(readings, columnar = True) # 10 000 000 floats
+	rows[5] # Output: (5, 0.25)
+	rows.column(1) # Output: array('d', [...])
+"""
+
+class Columns:
+	""" Rows of equal length columns, row tuples are built on access """
+
+	__slots__ = ("columns",)
+
+	def __init__(self, columns: typing.Sequence[typing.Sequence]) -> None:
+		if len({len(i) for i in columns}) > 1:
+			raise ValueError("\nValueError: expected columns of equal length")
+
+		self.columns = tuple(columns)
+
+	def __repr__(self) -> str:
+		kinds = ", ".join(f"array({i.typecode!r})" if isinstance(i, array.array) else type(i).__name__ for i in self.columns)
+
+		return f"Columns(rows={len(self)}, columns=[{kinds}])"
+
+	def __len__(self) -> int:
+		return len(self.columns[0]) if self.columns else 0
+
+	def __getitem__(self, key: typing.Union[int, slice]) -> typing.Union[tuple, "Columns"]:
+		if isinstance(key, slice):
+			return Columns([i[key] for i in self.columns])
+
+		if not isinstance(key, int):
+			raise TypeError("\nTypeError: expected int or slice object")
+
+		if key < 0:
+			key += len(self)
+
+		if not 0 <= key < len(self):
+			raise IndexError("\nIndexError: Columns index out of range")
+
+		return tuple([i[key] for i in self.columns])
+
+	def __iter__(self) -> typing.Iterator[tuple]:
+		return zip(*self.columns)
+
+	def __reversed__(self) -> typing.Iterator[tuple]:
+		return zip(*[reversed(i) for i in self.columns])
+
+	def __eq__(self, other: typing.Any) -> bool:
+		if isinstance(other, Columns):
+			return len(self) == len(other) and all(i == j for i, j in zip(self, other))
+
+		return NotImplemented
+
+	__hash__ = None
+
+	def column(self, position: int) -> typing.Sequence:
+		""" Return column of position (array.array, list or CustomRange) """
+
+		return self.columns[position]
+
+def _columns(rows: typing.Iterable[tuple], width: int) -> list:
+	""" Collect rows of width values into columns, array.array while all values of a column are ints or floats """
+
+	columns = [None] * width
+	kinds = [None] * width # int or float for array columns, None for list columns
+
+	for row in rows:
+		for position, value in enumerate(row):
+			column = columns[position]
+
+			if column is None:
+				# The first value chooses the column type
+				kind = type(value)
+
+				if kind is int or kind is float:
+					column = columns[position] = array.array('q' if kind is int else 'd')
+					kinds[position] = kind
+				else:
+					column = columns[position] = []
+
+			if type(value) is kinds[position]:
+				try:
+					column.append(value)
+
+					continue
+				except OverflowError:
+					pass
+
+			if kinds[position] is not None:
+				# Other type or int out of int64 range, the column becomes a list
+				column = columns[position] = column.tolist()
+				kinds[position] = None
+
+			column.append(value)
+
+	return [[] if i is None else i for i in columns]
+
+"""
+	---------- Checkpoints ----------
+
+	custom_map_generator, custom_filter_generator and custom_enumerate_generator take
+
+	* checkpoint = Checkpoint() - updated before every yielded item: offset is the number of
+	  read input items (rows for several iterables), count is the next enumerate count
+	* resume_from = state - Checkpoint, dict or JSON text of an earlier checkpoint,
+	  reading starts at its offset (and count)
+
+	A consumer that saves checkpoint.to_json() after handling an item gets every item at least
+	once after a restart. Sequences (list, tuple, range, str, bytes, array.array, ...) and
+	MappedRecords are resumed in O(1), other iterables are read again and offset items are skipped.
+	Checkpoints do not work together with workers, batch_size or offsets.
+
+	Example:
+
+	checkpoint = Checkpoint()
+
+	for result in custom_map_generator(enrich, records, checkpoint = checkpoint, resume_from = saved_state):
+		store(result)
+		saved_state = checkpoint.to_json() # Output: '{"offset": 1, "count": null}'
+"""
+
+class Checkpoint:
+	""" Position of a resumable generator: read input items and the next enumerate count """
+
+	__slots__ = ("offset", "count")
+
+	def __init__(self, offset: int = 0, count: typing.Optional[int] = None) -> None:
+		if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+			raise ValueError("\nValueError: expected not negative int offset")
+
+		if count is not None and (not isinstance(count, int) or isinstance(count, bool)):
+			raise TypeError("\nTypeError: expected int count or None")
+
+		self.offset = offset
+		self.count = count
+
+	def __repr__(self) -> str:
+		return f"Checkpoint(offset={self.offset}, count={self.count})"
+
+	def __eq__(self, other: typing.Any) -> bool:
+		if isinstance(other, Checkpoint):
+			return (self.offset, self.count) == (other.offset, other.count)
+
+		return NotImplemented
+
+	__hash__ = None
+
+	def state(self) -> dict:
+		""" Return state as a dict """
+
+		return {"offset": self.offset, "count": self.count}
+
+	def to_json(self) -> str:
+		""" Return state as JSON text """
+
+		import json
+
+		return json.dumps(self.state())
+
+	@classmethod
+	def load(cls, state: typing.Union["Checkpoint", dict, str]) -> "Checkpoint":
+		""" Return Checkpoint of a Checkpoint, state() dict or to_json() text """
+
+		if isinstance(state, Checkpoint):
+			return cls(state.offset, state.count)
+
+		if isinstance(state, str):
+			import json
+
+			state = json.loads(state)
+
+		if not isinstance(state, dict):
+			raise TypeError("\nTypeError: expected Checkpoint, dict or JSON text state")
+
+		return cls(state.get("offset", 0), state.get("count"))
+
+def _checkpoint_arguments(checkpoint: typing.Optional[Checkpoint], resume_from: typing.Any, workers: typing.Optional[int] = None, batch_size: typing.Optional[int] = None) -> Checkpoint:
+	""" Check arguments and return checkpoint set to the position of resume_from """
+
+	if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+		raise TypeError("\nTypeError: expected Checkpoint object or None")
+
+	if workers is not None or batch_size is not None:
+		raise ValueError("\nValueError: expected checkpoint without workers and batch_size")
+
+	start = Checkpoint() if resume_from is None else Checkpoint.load(resume_from)
+
+	if checkpoint is None:
+		return start
+
+	checkpoint.offset, checkpoint.count = start.offset, start.count
+
+	return checkpoint
+
+def _resumed_iterator(iterable: typing.Iterable, iterator: typing.Iterator, offset: int) -> typing.Iterator:
+	""" Return iterator of iterable from item offset, without reading the skipped items if possible """
+
+	if not offset:
+		return iterator
+
+	if hasattr(iterable, "iter_from"):
+		return iterable.iter_from(offset)
+
+	if _is_sequence(iterable):
+		if hasattr(iterator, "__setstate__"):
+			# Iterators of built-in sequences are moved to offset by their pickle support
+			iterator.__setstate__(offset)
+
+			return iterator
+
+		return (iterable[i] for i in range(offset, len(iterable)))
+
+	for _ in range(offset):
+		if next(iterator, _missing) is _missing:
+			break
+
+	return iterator
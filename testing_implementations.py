@@ -7,22 +7,69 @@
 	Modes:
 	- Without arguments: automatic testing
 	- With the --interactive flag: the user inputs the data manually
+	- With the --memory flag: peak memory regression check of the generators
+	- With the --parity flag: "numpy" backend results are compared with "python" backend
+	- With the --benchmark flag: every custom function is timed against its built-in
+	  --sizes 10,1000 : input sizes (default 10, 1000, 100000, 10000000)
+	  --output results.json : results file, .json or .csv (default benchmark_results.json)
+	  --compare baseline.json : fail if slowdown or peak memory regressed against baseline
+	  --tolerance 0.25 : allowed relative regression (default 25%)
+	  --noise 5 : slowdown changes below this many ns/element are noise (default 5)
+	- With the --overhead flag: per-call overhead of argument validation on 1-10 element inputs
+	- With the --allocations flag: live allocations of custom_map/custom_zip while a row is processed
+	- With the --importtime flag: "python -X importtime" of the implementation module against a budget
+	  --budget 20 : allowed import time in milliseconds (default 20)
 """
 
 import sys # for get list command line arguments
+import tracemalloc # for measure peak memory of the generators
+import array, operator # for backend parity inputs and operations
+import contextlib, io, warnings # for hide is_even() warnings about float values and NumPy overflow warnings
+import asyncio # for run async variants
+import functools, time, gc, json, csv # for benchmark built-ins, timing and results files
+import timeit, typing # for per-call overhead micro-benchmark
+import statistics # for median of benchmark runs
+import os, struct, tempfile # for memory-mapped file sources
+import subprocess, py_compile # for import time in a new interpreter
 
 # get functions names
 from implementation_built_in_python_functions import (
 	custom_range_generator,
+	CustomRange,
 	custom_filter,
 	custom_filter_generator,
 	custom_map,
 	custom_map_generator,
 	custom_zip,
 	custom_zip_generator,
+	custom_zip_longest,
+	custom_zip_longest_generator,
 	custom_reduce,
 	custom_enumerate,
-	custom_enumerate_generator
+	custom_enumerate_generator,
+	custom_any,
+	custom_all,
+	custom_sum,
+	custom_min,
+	custom_max,
+	custom_sorted,
+	custom_merge,
+	custom_window,
+	custom_groupby,
+	custom_chunked,
+	square,
+	is_even,
+	async_map,
+	async_filter,
+	async_zip,
+	async_enumerate,
+	Pipeline,
+	MapCache,
+	MappedRecords,
+	MappedLines,
+	Instrumentation,
+	FilterIndex,
+	Checkpoint
 )
 
 def automatic_tests():
@@ -36,6 +83,14 @@ def automatic_tests():
 	print("[2; 6) :", list(custom_range_generator(2, 6)))
 	print("[10; 2) step = -2 :", list(custom_range_generator(10, 2, -2)))
 
+	print("\n-> CustomRange")
+
+	shard = CustomRange(0, 10 ** 12, 3)
+
+	print(f"\n{shard} : len = {len(shard)}, 999999999999 in = {999999999999 in shard}, [-1] = {shard[-1]}")
+	print(f"{shard}[10:20:5] :", shard[10:20:5], "->", list(shard[10:20:5]))
+	print("reversed(CustomRange(10, 2, -2)) :", list(reversed(CustomRange(10, 2, -2))))
+
 	print('\n' + '-' * 119)
 
 	# ---------- custom_filter ----------
@@ -51,6 +106,7 @@ def automatic_tests():
 
 	print("\n\"Even\" numbers through custom_filter() :", list(custom_filter(is_even, nums_ls)))
 	print("\"Even\" numbers through custom_filter_generator():", list(custom_filter_generator(is_even, nums_ls)))
+	print("\"Even\" numbers through custom_filter_generator() with 2 worker threads :", list(custom_filter_generator(is_even, nums_ls, workers = 2, executor = "thread")))
 
 	print('\n' + '-' * 119)
 
@@ -66,6 +122,19 @@ def automatic_tests():
 
 	print("\n\"Square\" numbers through custom_map() :", list(custom_map(square, nums_ls)))
 	print("\"Square\" numbers through custom_map_generator() :", list(custom_map_generator(square, nums_ls)))
+	print("\"Square\" numbers through custom_map() with 2 worker processes :", custom_map(pow, nums_ls, [2] * len(nums_ls), workers = 2, chunksize = 2))
+	print("\"Square\" numbers batches of 4 through custom_map_generator() :", list(custom_map_generator(square, nums_ls, batch_size = 4)))
+
+	frame = bytes([3, 1, 4, 1, 5])
+	out = array.array('q', [0] * len(frame))
+
+	print(f"\"Square\" numbers of bytes {list(frame)} through custom_map() into preallocated array :", custom_map(square, frame, out = out).tolist(), out)
+
+	cache = MapCache(maxsize = 2)
+
+	repeated_ls = [3, 3, 7, 3, 7, 5]
+
+	print(f"\"Square\" numbers of {repeated_ls} through custom_map() with cache of 2 results :", custom_map(square, repeated_ls, cache = cache), cache.stats())
 
 	print('\n' + '-' * 119)
 
@@ -81,6 +150,10 @@ def automatic_tests():
 
 	print("\nZip first and second lists result through custom_zip() :", list(custom_zip(f_ls, s_ls)))
 	print("Zip first and second lists result through custom_zip_generator() :", list(custom_zip_generator(f_ls, s_ls)))
+	print("Zip first list and second list iterator result through custom_zip() :", list(custom_zip(f_ls, iter(s_ls))))
+	print("Zip first and second lists batches of 2 through custom_zip_generator() :", list(custom_zip_generator(f_ls, s_ls, batch_size = 2)))
+	print("Zip first list and 2 items of second list through custom_zip_longest() :", custom_zip_longest(f_ls, s_ls[:2], fillvalue = '-'))
+	print("Zip first list and 2 items of second list through custom_zip_longest_generator() :", list(custom_zip_longest_generator(f_ls, s_ls[:2])))
 
 	print('\n' + '-' * 119)
 
@@ -97,6 +170,14 @@ def automatic_tests():
 
 	print("\ncustom_reduce() function application result :", custom_reduce(multiply, nums_ls))
 	print(f"custom_reduce() function application with {mult_num} multiply number result :", custom_reduce(multiply, nums_ls, mult_num))
+	print(f"custom_reduce() associative application with {mult_num} multiply number on 2 worker threads result :", custom_reduce(multiply, nums_ls, mult_num, associative = True, workers = 2, chunksize = 2, executor = "thread"))
+
+	floats_ls = [0.1] * 10
+
+	print(f"\nList float values : {floats_ls}")
+
+	print("\ncustom_reduce() sum result :", custom_reduce(operator.add, floats_ls))
+	print("custom_reduce() pairwise sum result :", custom_reduce(operator.add, floats_ls, associative = True, pairwise = True))
 
 	print('\n' + '-' * 119)
 
@@ -110,6 +191,225 @@ def automatic_tests():
 	print("\ncustom_enumerate() function application result :", list(custom_enumerate(items)))
 	print("custom_enumerate_generator() function application result :", list(custom_enumerate_generator(items)))
 
+	rows = custom_enumerate(CustomRange(1000000), 1, view = True)
+
+	print(f"\ncustom_enumerate(view = True) of {len(rows)} items, page rows[1000:1005] :", list(rows[1000:1005]))
+	print("Reversed page rows[1000:1005] :", list(reversed(rows[1000:1005])))
+	print("custom_zip(view = True) items zip[1], zip[-1] :", custom_zip(items, [10, 20, 30], view = True)[1], custom_zip(items, [10, 20, 30], view = True)[-1])
+
+	columns = custom_zip(items, [10, 20, 30], [0.5, 1.5, 2.5], columnar = True)
+
+	print(f"\ncustom_zip(columnar = True) result : {columns}, rows : {list(columns)}, columns[1] : {columns[1]}")
+
+	def result_memory(call):
+		""" Traced memory of the kept result in bytes """
+
+		tracemalloc.start()
+		result = call()
+		size = tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+
+		return size
+
+	size = 10 ** 5
+
+	print(f"Memory of custom_enumerate() result of {size} ints : {result_memory(lambda : custom_enumerate(range(size)))} bytes")
+	print(f"Memory of custom_enumerate(columnar = True) result of {size} ints : {result_memory(lambda : custom_enumerate(range(size), columnar = True))} bytes")
+
+	print('\n' + '-' * 119)
+
+	# ---------- custom_any / custom_all / custom_sum / custom_min / custom_max ----------
+
+	print("\n-> custom_any() / custom_all() / custom_sum() / custom_min() / custom_max()")
+
+	nums_ls = [3, 8, -2, 7, 0]
+	checked = []
+
+	def is_negative(num):
+		checked.append(num)
+		return num < 0
+
+	print(f"\nList numbers values : {nums_ls}")
+
+	print("\ncustom_any() of \"negative\" numbers through custom_map_generator() :", custom_any(custom_map_generator(is_negative, nums_ls)), "| checked numbers :", checked)
+	print("custom_all() of \"even\" numbers :", custom_all(custom_map_generator(lambda num : num % 2 == 0, nums_ls)))
+	print("custom_sum() result :", custom_sum(nums_ls), "| with start 100 :", custom_sum(nums_ls, 100))
+	print("custom_min() / custom_max() result :", custom_min(nums_ls), "/", custom_max(nums_ls))
+	print("custom_min() / custom_max() by abs :", custom_min(nums_ls, key = abs), "/", custom_max(*nums_ls, key = abs))
+	print("custom_max() of empty list with default None :", custom_max([], default = None))
+
+	print(f"\nList float values : {floats_ls}")
+
+	print("\ncustom_sum() result :", custom_sum(floats_ls), "| sum() result :", sum(floats_ls))
+
+	print('\n' + '-' * 119)
+
+	# ---------- custom_sorted ----------
+
+	print("\n-> custom_sorted()")
+
+	events = [(3, 'c'), (1, 'a'), (2, 'b'), (1, 'd'), (3, 'e'), (2, 'f'), (1, 'g')]
+
+	print(f"\nList events values : {events}")
+
+	print("\ncustom_sorted() function application result :", custom_sorted(events))
+	print("custom_sorted() by time, reverse :", custom_sorted(events, key = lambda event : event[0], reverse = True))
+	print("custom_sorted() by time with max_memory = 2 (4 runs in temporary files) :", list(custom_sorted(events, key = lambda event : event[0], max_memory = 2)))
+
+	late_events = custom_filter_generator(lambda event : event[0] > 1, events)
+	names = custom_map_generator(lambda event : event[1], custom_sorted(late_events, key = lambda event : event[0], max_memory = 2))
+
+	print("Names of sorted events with time > 1 through generators :", list(names))
+
+	shards = [[(1, 'a'), (3, 'c')], [(1, 'd'), (2, 'f')], [(2, 'b'), (3, 'e')]]
+
+	print(f"\nSorted shards values : {shards}")
+
+	print("\ncustom_merge() of shards by time :", list(custom_merge(*shards, key = lambda event : event[0])))
+
+	print('\n' + '-' * 119)
+
+	# ---------- custom_window / custom_groupby / custom_chunked ----------
+
+	print("\n-> custom_window() / custom_groupby() / custom_chunked()")
+
+	nums_ls = [1, 2, 3, 4, 5, 6, 7]
+
+	print(f"\nList numbers values : {nums_ls}")
+
+	print("\nSliding windows of 3 through custom_window() :", list(custom_window(nums_ls, 3)))
+	print("Tumbling windows of 3 through custom_window() :", list(custom_window(nums_ls, 3, 3)))
+	print("Rolling average of 3 numbers :", [custom_sum(window) / 3 for window in custom_window(nums_ls, 3)])
+	print("custom_chunked() by 3 result :", list(custom_chunked(nums_ls, 3)))
+	print("custom_groupby() \"even\" and \"odd\" runs of events times :", [(key, list(group)) for key, group in custom_groupby(events, key = lambda event : event[0] % 2 == 0)])
+
+	print('\n' + '-' * 119)
+
+	# ---------- async variants ----------
+
+	print("\n-> async_map() / async_filter() / async_zip() / async_enumerate()")
+
+	async def source(values): # fake async source instead of network
+		for i in values:
+			await asyncio.sleep(0)
+			yield i
+
+	async def async_square(x):
+		await asyncio.sleep(0.01)
+		return x * x
+
+	async def collect(async_iterable):
+		return [i async for i in async_iterable]
+
+	nums_ls = [-2, 7, 0, 3, 5, -5]
+
+	print(f"\nList numbers values : {nums_ls}")
+
+	print("\n\"Square\" numbers through async_map() with concurrency = 3 :", asyncio.run(collect(async_map(async_square, source(nums_ls), concurrency = 3))))
+	print("\"Even\" numbers through async_filter() :", asyncio.run(collect(async_filter(is_even, source(nums_ls)))))
+	print("Zip numbers and items through async_zip() :", asyncio.run(collect(async_zip(source(nums_ls), items))))
+	print("async_enumerate() function application result :", asyncio.run(collect(async_enumerate(source(items), 1))))
+
+	print('\n' + '-' * 119)
+
+	# ---------- Pipeline ----------
+
+	print("\n-> Pipeline")
+
+	nums_ls = [-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5]
+
+	print(f"\nList numbers values : {nums_ls}")
+
+	print("\n\"Even\" numbers squares enumerated from 1 :", Pipeline(nums_ls).filter(is_even).map(square).enumerate(1).to_list())
+	print("Sum of \"even\" numbers squares :", Pipeline(nums_ls).filter(is_even).map(square).reduce(operator.add))
+
+	print('\n' + '-' * 119)
+
+	# ---------- memory-mapped file sources ----------
+
+	print("\n-> MappedRecords / MappedLines")
+
+	with tempfile.TemporaryDirectory() as directory:
+		records_path = os.path.join(directory, "records.bin")
+		lines_path = os.path.join(directory, "lines.txt")
+
+		with open(records_path, "wb") as file:
+			file.write(b"".join(struct.pack("<qd", i, i / 2) for i in range(5)))
+
+		with open(lines_path, "wb") as file:
+			file.write(b"apple\nbanana\ncherry\n")
+
+		with MappedRecords(records_path, "<qd") as records, MappedLines(lines_path) as lines:
+			print(f"\n{len(records)} records \"<qd\" :", list(records))
+			print("Records with \"even\" first field through custom_filter_generator() :", list(custom_filter_generator(lambda record : is_even(record[0]), records)))
+			print("Lines with byte offsets through custom_enumerate(offsets = True) :", custom_enumerate(lines, offsets = True))
+
+	print('\n' + '-' * 119)
+
+	# ---------- Instrumentation ----------
+
+	print("\n-> Instrumentation")
+
+	def slow_square(x):
+		time.sleep(0.001)
+		return x * x
+
+	with Instrumentation() as metrics:
+		custom_map(slow_square, range(20))
+		list(custom_filter_generator(is_even, range(20), batch_size = 5))
+
+	for name, record in metrics.as_dict().items():
+		print(f"\n{name}() : {record['calls']} calls, {record['elements']} elements, {record['callbacks']} callbacks, peak {record['peak_buffered']} buffered items")
+		print(f"callback time {record['callback_time']:.4f} s, framework time {record['framework_time']:.4f} s")
+
+	print("\nPrometheus text of custom_map() calls :\n")
+	print("\n".join(line for line in metrics.prometheus().splitlines() if "custom_map" in line))
+
+	print('\n' + '-' * 119)
+
+	# ---------- FilterIndex ----------
+
+	print("\n-> FilterIndex")
+
+	by_time = FilterIndex(events, key = lambda event : event[0])
+
+	print(f"\nFilterIndex of events by time : {by_time}")
+
+	print("\nEvents with time == 2 through custom_filter() :", custom_filter(by_time.equal(2), by_time))
+	print("Events with 1 <= time < 3 through custom_filter_generator() :", list(custom_filter_generator(by_time.between(1, 3), by_time)))
+
+	by_time.append((2, 'h'))
+
+	print("Events with time == 2 after append((2, 'h')), index is rebuilt :", custom_filter(by_time.equal(2), by_time))
+
+	readings = FilterIndex([1.0, 9.0, 3.0, float('nan'), 1.0, 5.0, 5.0, float('nan')])
+
+	print(f"\nFilterIndex of readings with nan : {readings}")
+	print("Readings with 2 <= value < 6 through the index :", custom_filter(readings.between(2, 6), readings))
+	print("Readings with 2 <= value < 6 through a scan :", custom_filter(lambda x : 2 <= x < 6, list(readings)))
+	print("Readings equal to nan through the index :", custom_filter(readings.equal(float('nan')), readings))
+
+	print('\n' + '-' * 119)
+
+	# ---------- Checkpoint ----------
+
+	print("\n-> Checkpoint")
+
+	print(f"\nList items values : {items}")
+
+	checkpoint = Checkpoint()
+	saved_state = None
+
+	for pair in custom_enumerate_generator(items, 1, checkpoint = checkpoint):
+		saved_state = checkpoint.to_json()
+
+		print(f"\ncustom_enumerate_generator() item {pair}, saved state : {saved_state}")
+
+		break # the job is stopped after the first item
+
+	print("Resumed custom_enumerate_generator() from saved state :", list(custom_enumerate_generator(items, 1, resume_from = saved_state)))
+	print("Resumed custom_map_generator() of range(10 ** 12) from offset 10 ** 12 - 3 :", list(custom_map_generator(square, range(10 ** 12), resume_from = {"offset": 10 ** 12 - 3})))
+
 	print("\nAutomatic testing is completed.\n")
 
 def interactive_tests():
@@ -184,6 +484,519 @@ def interactive_tests():
 
 	print("\nInteractive testing is completed.\n")
 
+def peak_memory(generator):
+	""" Consume generator and return peak traced memory in bytes """
+
+	tracemalloc.start()
+
+	for _ in generator:
+		pass
+
+	peak = tracemalloc.get_traced_memory()[1]
+
+	tracemalloc.stop()
+
+	return peak
+
+def memory_tests():
+	print(f"\n{'*' * 50} MEMORY TESTING {'*' * 50}")
+
+	small_size, large_size = 10 ** 3, 10 ** 7
+	allowed_growth = 64 * 1024 # bytes, peak memory must not depend on input size
+
+	def is_even(num): return not (num & 1)
+	def square(x): return x * x
+
+	generators = {
+		"custom_filter_generator()": lambda size : custom_filter_generator(is_even, range(size)),
+		"custom_map_generator()": lambda size : custom_map_generator(square, range(size)),
+		"custom_enumerate_generator()": lambda size : custom_enumerate_generator(range(size)),
+		"custom_window()": lambda size : custom_window(range(size), 100)
+	}
+
+	failed = []
+
+	for name, make_generator in generators.items():
+		small_peak = peak_memory(make_generator(small_size))
+		large_peak = peak_memory(make_generator(large_size))
+
+		print(f"\n-> {name}")
+		print(f"\nPeak memory over {small_size} elements : {small_peak} bytes")
+		print(f"Peak memory over {large_size} elements : {large_peak} bytes")
+
+		if large_peak - small_peak > allowed_growth:
+			failed.append(name)
+
+	print('\n' + '-' * 119)
+
+	if failed:
+		print(f"\nMemory testing is failed, peak memory grows with input size: {', '.join(failed)}\n")
+		sys.exit(1)
+
+	print("\nMemory testing is completed.\n")
+
+def parity_tests():
+	print(f"\n{'*' * 50} BACKEND PARITY TESTING {'*' * 50}")
+
+	try:
+		import numpy
+		print("\nNumPy is installed, \"numpy\" backend uses vectorized kernels")
+	except ImportError:
+		numpy = None
+		print("\nNumPy is not installed, \"numpy\" backend falls back to Python loop")
+
+	inputs = [
+		array.array('q', [-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5]),
+		array.array('i', []),
+		array.array('B', [0, 7, 255]),
+		array.array('d', [0.1, 0.2, 0.3, -1e300, 1e300]),
+		array.array('f', [1.5, -2.25, 3.125]),
+		array.array('q', [2 ** 40, 3, -2 ** 40]), # int64 overflow goes to Python loop
+		memoryview(array.array('h', [10, 11, 12, 13])),
+		memoryview(b"telemetry")
+	]
+
+	if numpy is not None:
+		# Items of ndarray are NumPy scalars (wrapping int8, rejected by is_even), kernels must not change that
+		inputs += [
+			numpy.array([1, 2, 3, 100], dtype = numpy.int8),
+			numpy.array([-5, 0, 5, 2 ** 40], dtype = numpy.int64),
+			numpy.array([0.5, -1.25, 300.0], dtype = numpy.float16)
+		]
+
+	calls = {
+		"custom_map(square)": lambda values, backend : custom_map(square, values, backend = backend),
+		"custom_map(is_even)": lambda values, backend : custom_map(is_even, values, backend = backend),
+		"custom_map(operator.add)": lambda values, backend : custom_map(operator.add, values, values, backend = backend),
+		"custom_map(operator.mul)": lambda values, backend : custom_map(operator.mul, values, values[:2], backend = backend),
+		"custom_filter(is_even)": lambda values, backend : custom_filter(is_even, values, backend = backend),
+		"custom_reduce(operator.add)": lambda values, backend : custom_reduce(operator.add, values, backend = backend),
+		"custom_reduce(operator.mul, initial)": lambda values, backend : custom_reduce(operator.mul, values, 3, backend = backend)
+	}
+
+	def run(call, values, backend):
+		try:
+			with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+				warnings.simplefilter("ignore") # int8 items of ndarray wrap around with RuntimeWarning
+				result = call(values, backend)
+		except Exception as error:
+			return type(error)
+
+		# Types are compared too: kernels must return Python int/float/bool
+		return result, [type(i) for i in result] if isinstance(result, list) else type(result)
+
+	failed = []
+
+	for name, call in calls.items():
+		for values in inputs:
+			if run(call, values, "python") != run(call, values, "numpy"):
+				failed.append(f"{name} over {values!r}")
+
+	print('\n' + '-' * 119)
+
+	if failed:
+		print("\nBackend parity testing is failed:\n\n" + "\n".join(failed) + "\n")
+		sys.exit(1)
+
+	print(f"\n{len(calls) * len(inputs)} cases have identical results.")
+	print("\nBackend parity testing is completed.\n")
+
+def argument_value(name, default):
+	""" Return command line value after name or default """
+
+	if name in sys.argv and sys.argv.index(name) + 1 < len(sys.argv):
+		return sys.argv[sys.argv.index(name) + 1]
+
+	return default
+
+def consume(result):
+	""" Iterate lazy results (generators, map/filter/zip objects), lists are already computed """
+
+	if not isinstance(result, (list, int)):
+		for _ in result:
+			pass
+
+def timing(call, make_input, loops):
+	""" Return ns of one call(*inputs), averaged over loops calls """
+
+	inputs = [make_input() for _ in range(loops)]
+
+	start = time.perf_counter_ns()
+
+	for data in inputs:
+		consume(call(*data))
+
+	return (time.perf_counter_ns() - start) / loops
+
+def peak_call_memory(call, make_input):
+	""" Return peak memory in bytes of one call(*inputs), inputs are not counted """
+
+	data = make_input()
+
+	tracemalloc.start()
+	consume(call(*data))
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return peak
+
+def measure(custom_call, builtin_call, make_input, size):
+	""" Return (custom ns per element, built-in ns per element, slowdown, custom peak memory, built-in peak memory) """
+
+	# Small inputs are called many times per measurement, timer overhead is not measured
+	loops = max(1, 10_000 // max(size, 1))
+
+	runs = 5 # the median of the runs is reported
+	run_time = 100_000_000 # ns, minimum time of the custom and of the built-in function in every run
+
+	custom_runs, builtin_runs, slowdown_runs = [], [], []
+
+	# Like timeit, garbage collector is disabled and the best timing of a run is taken
+	gc_enabled = gc.isenabled()
+	gc.disable()
+
+	try:
+		# The median of several runs is taken, one disturbed run does not move it
+		for _ in range(runs):
+			custom_timings, builtin_timings = [], []
+
+			# Custom and built-in timings alternate until each of them has spent the minimum time of a run
+			while sum(custom_timings) * loops < run_time or sum(builtin_timings) * loops < run_time:
+				custom_timings.append(timing(custom_call, make_input, loops))
+				builtin_timings.append(timing(builtin_call, make_input, loops))
+
+			custom_runs.append(min(custom_timings))
+			builtin_runs.append(min(builtin_timings))
+
+			# Slowdown is the median ratio of neighbouring timings: machine load affects both of them alike
+			slowdown_runs.append(statistics.median(c / b for c, b in zip(custom_timings, builtin_timings)))
+	finally:
+		if gc_enabled:
+			gc.enable()
+
+	size = max(size, 1)
+
+	return (
+		statistics.median(custom_runs) / size,
+		statistics.median(builtin_runs) / size,
+		statistics.median(slowdown_runs),
+		peak_call_memory(custom_call, make_input),
+		peak_call_memory(builtin_call, make_input)
+	)
+
+def benchmark_inputs(size):
+	""" Input factories of every input type, the generator one is made again for every run """
+
+	values = list(range(size))
+
+	return {
+		"list": lambda : values,
+		"tuple": (lambda data : lambda : data)(tuple(values)),
+		"generator": lambda : (i for i in values),
+		"array": (lambda data : lambda : data)(array.array('q', values))
+	}
+
+def benchmark_cases():
+	""" {custom function name: (built-in name, arity, custom call, built-in call)}, calls take arity inputs """
+
+	def is_even_number(num): return not (num & 1)
+	def square_number(x): return x * x
+
+	return {
+		"custom_filter": ("filter", 1, lambda data : custom_filter(is_even_number, data), lambda data : list(filter(is_even_number, data))),
+		"custom_filter_generator": ("filter", 1, lambda data : custom_filter_generator(is_even_number, data), lambda data : filter(is_even_number, data)),
+		"custom_map": ("map", 1, lambda data : custom_map(square_number, data), lambda data : list(map(square_number, data))),
+		"custom_map_generator": ("map", 1, lambda data : custom_map_generator(square_number, data), lambda data : map(square_number, data)),
+		"custom_zip": ("zip", 2, lambda first, second : custom_zip(first, second), lambda first, second : list(zip(first, second))),
+		"custom_zip_generator": ("zip", 2, lambda first, second : custom_zip_generator(first, second), lambda first, second : zip(first, second)),
+		"custom_reduce": ("functools.reduce", 1, lambda data : custom_reduce(operator.add, data), lambda data : functools.reduce(operator.add, data)),
+		"custom_enumerate": ("enumerate", 1, lambda data : custom_enumerate(data), lambda data : list(enumerate(data))),
+		"custom_enumerate_generator": ("enumerate", 1, lambda data : custom_enumerate_generator(data), lambda data : enumerate(data))
+	}
+
+def write_results(results, path):
+	""" Save results as JSON or CSV by file extension """
+
+	with open(path, 'w', newline = '') as file:
+		if path.endswith(".csv"):
+			writer = csv.DictWriter(file, fieldnames = list(results[0]))
+			writer.writeheader()
+			writer.writerows(results)
+		else:
+			json.dump(results, file, indent = 4)
+
+def read_results(path):
+	""" Load results saved by write_results() """
+
+	with open(path, newline = '') as file:
+		if not path.endswith(".csv"):
+			return json.load(file)
+
+		results = list(csv.DictReader(file))
+
+	for row in results:
+		for key in ("size", "ns_per_element", "builtin_ns_per_element", "slowdown", "peak_memory", "builtin_peak_memory"):
+			row[key] = float(row[key])
+
+	return results
+
+def compare_results(results, baseline, tolerance, noise):
+	""" Return descriptions of regressions against baseline, noise - ns per element that are not counted """
+
+	baseline_rows = {(row["function"], row["input_type"], int(row["size"])): row for row in baseline}
+	regressions = []
+
+	for row in results:
+		old = baseline_rows.get((row["function"], row["input_type"], int(row["size"])))
+
+		if old is None:
+			continue
+
+		# Slowdown against the built-in is compared, not raw time, it does not depend on the machine.
+		# On small inputs a few ns/element change the ratio a lot, so the extra time over
+		# the baseline slowdown must also be above the noise floor
+		extra = row["ns_per_element"] - old["slowdown"] * row["builtin_ns_per_element"]
+
+		if row["slowdown"] > old["slowdown"] * (1 + tolerance) and extra > noise:
+			regressions.append(f"{row['function']}({row['input_type']}, {int(row['size'])}) slowdown : {old['slowdown']:.2f} -> {row['slowdown']:.2f}")
+
+		if row["peak_memory"] > old["peak_memory"] * (1 + tolerance) + 1024:
+			regressions.append(f"{row['function']}({row['input_type']}, {int(row['size'])}) peak memory : {int(old['peak_memory'])} -> {int(row['peak_memory'])} bytes")
+
+	return regressions
+
+def benchmark_tests():
+	print(f"\n{'*' * 50} BENCHMARK {'*' * 50}")
+
+	sizes = [int(i) for i in argument_value("--sizes", "10,1000,100000,10000000").split(",")]
+	output = argument_value("--output", "benchmark_results.json")
+	baseline = argument_value("--compare", None)
+	tolerance = float(argument_value("--tolerance", "0.25"))
+	noise = float(argument_value("--noise", "5"))
+
+	results = []
+
+	def add_result(function, builtin, input_type, size, custom_call, builtin_call, make_input):
+		ns_per_element, builtin_ns_per_element, slowdown, peak, builtin_peak = measure(custom_call, builtin_call, make_input, size)
+
+		results.append({
+			"function": function,
+			"builtin": builtin,
+			"input_type": input_type,
+			"size": size,
+			"ns_per_element": round(ns_per_element, 3),
+			"builtin_ns_per_element": round(builtin_ns_per_element, 3),
+			"slowdown": round(slowdown, 3),
+			"peak_memory": peak,
+			"builtin_peak_memory": builtin_peak
+		})
+
+		row = results[-1]
+
+		print(f"{function:<28} {input_type:<10} {size:>9} : {row['ns_per_element']:>9.1f} ns/element, x{row['slowdown']:<7.2f} peak {peak} bytes")
+
+	for size in sizes:
+		print(f"\n-> size {size}\n")
+
+		add_result("custom_range_generator", "range", "int", size, custom_range_generator, range, lambda : (size,))
+
+		for input_type, make_input in benchmark_inputs(size).items():
+			for function, (builtin, arity, custom_call, builtin_call) in benchmark_cases().items():
+				# Every argument gets its own input, a generator can not be consumed twice
+				make_inputs = lambda make_input = make_input, arity = arity : tuple(make_input() for _ in range(arity))
+
+				add_result(function, builtin, input_type, size, custom_call, builtin_call, make_inputs)
+
+	write_results(results, output)
+
+	print('\n' + '-' * 119)
+	print(f"\nResults are saved to {output}")
+
+	if baseline is not None:
+		regressions = compare_results(results, read_results(baseline), tolerance, noise)
+
+		if regressions:
+			print(f"\nBenchmark is failed, regressions against {baseline}:\n\n" + "\n".join(regressions) + "\n")
+			sys.exit(1)
+
+		print(f"\nNo regressions against {baseline}")
+
+	print("\nBenchmark is completed.\n")
+
+def overhead_tests():
+	print(f"\n{'*' * 50} VALIDATION OVERHEAD {'*' * 50}")
+
+	def per_call_ns(call):
+		""" Best ns of one call """
+
+		timer = timeit.Timer(call)
+		number = timer.autorange()[0]
+
+		return min(timer.repeat(5, number)) / number * 1e9
+
+	values = [1]
+
+	print("\n-> Iterable checks of one list\n")
+
+	print(f"isinstance(x, typing.Iterable) : {per_call_ns(lambda : isinstance(values, typing.Iterable)):.0f} ns")
+	print(f"iter(x) : {per_call_ns(lambda : iter(values)):.0f} ns")
+
+	def square_number(x): return x * x
+
+	calls = {
+		"custom_filter": lambda data, validate : custom_filter(None, data, validate = validate),
+		"custom_map": lambda data, validate : custom_map(square_number, data, validate = validate),
+		"custom_zip": lambda data, validate : custom_zip(data, data, validate = validate),
+		"custom_reduce": lambda data, validate : custom_reduce(operator.add, data, validate = validate),
+		"custom_enumerate": lambda data, validate : custom_enumerate(data, validate = validate)
+	}
+
+	print("\n-> ns per call, validate = True / validate = False\n")
+
+	for size in (1, 10):
+		data = list(range(1, size + 1))
+
+		for name, call in calls.items():
+			checked = per_call_ns(lambda : call(data, True))
+			trusted = per_call_ns(lambda : call(data, False))
+
+			print(f"{name:<18} {size:>2} elements : {checked:>6.0f} / {trusted:>6.0f} ns")
+
+	print('\n' + '-' * 119)
+	print("\nValidation overhead testing is completed.\n")
+
+def live_blocks(filename):
+	""" Number of live memory blocks allocated by lines of filename """
+
+	snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, filename)])
+
+	return sum(statistic.count for statistic in snapshot.statistics("filename"))
+
+def allocation_tests():
+	print(f"\n{'*' * 50} ALLOCATION TESTING {'*' * 50}")
+
+	import implementation_built_in_python_functions
+
+	filename = implementation_built_in_python_functions.__file__
+	size, probes = 100, (10, 90)
+
+	# Per call: result list, list of iterators, one iterator per iterable, one row list, generator frame.
+	# Generators add the generator object itself, created by the instrumentation wrapper inside the module.
+	# Everything above that is allocated per row.
+	def budget(count, generator): return count + 3 + generator
+
+	def map_blocks(call, count):
+		""" Live blocks inside the mapped function on probe rows """
+
+		blocks = []
+
+		def function(*args):
+			if args[0] in probes and tracemalloc.is_tracing():
+				blocks.append(live_blocks(filename))
+
+			return args[0]
+
+		consume(call(function, *[list(range(size)) for _ in range(count)])) # warm-up, one-time allocations are not traced
+
+		tracemalloc.start()
+		consume(call(function, *[list(range(size)) for _ in range(count)]))
+		tracemalloc.stop()
+
+		return blocks
+
+	def zip_blocks(count):
+		""" Live blocks while the consumer holds the probe rows """
+
+		blocks = []
+
+		consume(custom_zip_generator(*[list(range(size)) for _ in range(count)])) # warm-up
+
+		tracemalloc.start()
+
+		for row in custom_zip_generator(*[list(range(size)) for _ in range(count)]):
+			if row[0] in probes:
+				blocks.append(live_blocks(filename))
+
+		tracemalloc.stop()
+
+		return blocks
+
+	cases = []
+
+	for count in (1, 2, 3, 4):
+		cases.append((f"custom_map() of {count} iterables", count, False, map_blocks(custom_map, count)))
+		cases.append((f"custom_map_generator() of {count} iterables", count, True, map_blocks(custom_map_generator, count)))
+
+	for count in (2, 3, 4):
+		cases.append((f"custom_zip_generator() of {count} iterables", count, True, zip_blocks(count)))
+
+	failed = []
+
+	print(f"\n-> Live blocks of the module on rows {probes[0]} and {probes[1]}\n")
+
+	for name, count, generator, blocks in cases:
+		print(f"{name:<42} : {blocks[0]} / {blocks[1]} (budget {budget(count, generator)})")
+
+		if blocks[0] != blocks[1] or max(blocks) > budget(count, generator):
+			failed.append(name)
+
+	print('\n' + '-' * 119)
+
+	if failed:
+		print(f"\nAllocation testing is failed, temporaries are allocated per row: {', '.join(failed)}\n")
+		sys.exit(1)
+
+	print("\nAllocation testing is completed.\n")
+
+def import_time_tests():
+	print(f"\n{'*' * 50} IMPORT TIME TESTING {'*' * 50}")
+
+	module = "implementation_built_in_python_functions"
+	lazy_modules = ("typing", "asyncio", "concurrent.futures", "inspect") # imported only when used
+	budget = float(argument_value("--budget", 20)) # milliseconds
+
+	# Short-lived workers import the cached bytecode, not the source
+	py_compile.compile(os.path.join(os.path.dirname(os.path.abspath(__file__)), module + ".py"), cfile = None)
+
+	code = f"import sys, {module}; print(','.join(name for name in {lazy_modules!r} if name in sys.modules))"
+	timings, loaded = [], ""
+
+	for _ in range(5):
+		process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output = True, text = True, check = True)
+
+		for line in process.stderr.splitlines():
+			if line.rstrip().endswith(f"| {module}"):
+				timings.append(int(line.split("|")[1]) / 1000) # cumulative microseconds
+
+		loaded = process.stdout.strip()
+
+	print(f"\n-> import {module}")
+	print(f"\nBest import time of 5 runs : {min(timings):.1f} ms (budget {budget:g} ms)")
+	print(f"Lazy modules imported at import : {loaded or 'none'}")
+
+	print('\n' + '-' * 119)
+
+	if min(timings) > budget or loaded:
+		print("\nImport time testing is failed.\n")
+		sys.exit(1)
+
+	print("\nImport time testing is completed.\n")
+
 if __name__ == "__main__":
-	interactive_tests() if "--interactive" in sys.argv else automatic_tests()
+	if "--interactive" in sys.argv:
+		interactive_tests()
+	elif "--memory" in sys.argv:
+		memory_tests()
+	elif "--parity" in sys.argv:
+		parity_tests()
+	elif "--benchmark" in sys.argv:
+		benchmark_tests()
+	elif "--overhead" in sys.argv:
+		overhead_tests()
+	elif "--allocations" in sys.argv:
+		allocation_tests()
+	elif "--importtime" in sys.argv:
+		import_time_tests()
+	else:
+		automatic_tests()
 